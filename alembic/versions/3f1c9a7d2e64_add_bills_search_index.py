@@ -0,0 +1,92 @@
+"""Add FTS5 search index over bills
+
+Revision ID: 3f1c9a7d2e64
+Revises: 50b6494939cc
+Create Date: 2026-10-19 09:12:31.402117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a7d2e64"
+down_revision: Union[str, None] = "50b6494939cc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Word index (ranked + prefix matching) and trigram index (fuzzy matching)
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS bills_fts USING fts5(
+            name, recipient,
+            content='bills', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """
+    )
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS bills_trigram USING fts5(
+            name, recipient,
+            content='bills', content_rowid='id',
+            tokenize='trigram'
+        )
+    """
+    )
+
+    # Keep both indexes in sync with the bills table
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bills_search_ai AFTER INSERT ON bills BEGIN
+            INSERT INTO bills_fts(rowid, name, recipient)
+                VALUES (new.id, new.name, new.recipient);
+            INSERT INTO bills_trigram(rowid, name, recipient)
+                VALUES (new.id, new.name, new.recipient);
+        END
+    """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bills_search_ad AFTER DELETE ON bills BEGIN
+            INSERT INTO bills_fts(bills_fts, rowid, name, recipient)
+                VALUES ('delete', old.id, old.name, old.recipient);
+            INSERT INTO bills_trigram(bills_trigram, rowid, name, recipient)
+                VALUES ('delete', old.id, old.name, old.recipient);
+        END
+    """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS bills_search_au
+        AFTER UPDATE OF name, recipient ON bills BEGIN
+            INSERT INTO bills_fts(bills_fts, rowid, name, recipient)
+                VALUES ('delete', old.id, old.name, old.recipient);
+            INSERT INTO bills_trigram(bills_trigram, rowid, name, recipient)
+                VALUES ('delete', old.id, old.name, old.recipient);
+            INSERT INTO bills_fts(rowid, name, recipient)
+                VALUES (new.id, new.name, new.recipient);
+            INSERT INTO bills_trigram(rowid, name, recipient)
+                VALUES (new.id, new.name, new.recipient);
+        END
+    """
+    )
+
+    # Index existing bills
+    op.execute("INSERT INTO bills_fts(bills_fts) VALUES ('rebuild')")
+    op.execute("INSERT INTO bills_trigram(bills_trigram) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS bills_search_au")
+    op.execute("DROP TRIGGER IF EXISTS bills_search_ad")
+    op.execute("DROP TRIGGER IF EXISTS bills_search_ai")
+    op.execute("DROP TABLE IF EXISTS bills_trigram")
+    op.execute("DROP TABLE IF EXISTS bills_fts")
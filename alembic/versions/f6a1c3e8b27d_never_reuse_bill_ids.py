@@ -0,0 +1,96 @@
+"""Never reuse bill ids (AUTOINCREMENT)
+
+Revision ID: f6a1c3e8b27d
+Revises: e3b8d6f2a571
+Create Date: 2026-10-19 16:05:41.220913
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a1c3e8b27d"
+down_revision: Union[str, None] = "e3b8d6f2a571"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rebuilding the table drops its triggers; recreate the search index ones.
+# The FTS5 tables are keyed by bill id, which the rebuild keeps, so their
+# content stays valid.
+SEARCH_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS bills_search_ai AFTER INSERT ON bills BEGIN
+        INSERT INTO bills_fts(rowid, name, recipient)
+            VALUES (new.id, new.name, new.recipient);
+        INSERT INTO bills_trigram(rowid, name, recipient)
+            VALUES (new.id, new.name, new.recipient);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bills_search_ad AFTER DELETE ON bills BEGIN
+        INSERT INTO bills_fts(bills_fts, rowid, name, recipient)
+            VALUES ('delete', old.id, old.name, old.recipient);
+        INSERT INTO bills_trigram(bills_trigram, rowid, name, recipient)
+            VALUES ('delete', old.id, old.name, old.recipient);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bills_search_au
+    AFTER UPDATE OF name, recipient ON bills BEGIN
+        INSERT INTO bills_fts(bills_fts, rowid, name, recipient)
+            VALUES ('delete', old.id, old.name, old.recipient);
+        INSERT INTO bills_trigram(bills_trigram, rowid, name, recipient)
+            VALUES ('delete', old.id, old.name, old.recipient);
+        INSERT INTO bills_fts(rowid, name, recipient)
+            VALUES (new.id, new.name, new.recipient);
+        INSERT INTO bills_trigram(rowid, name, recipient)
+            VALUES (new.id, new.name, new.recipient);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table(
+        "bills",
+        recreate="always",
+        table_kwargs={"sqlite_autoincrement": True},
+    ):
+        pass
+    for statement in SEARCH_TRIGGERS:
+        op.execute(statement)
+
+    # Ids of bills deleted before this migration may still be in the audit
+    # log; start numbering after the highest id either table has seen
+    op.execute(
+        """
+        UPDATE sqlite_sequence
+        SET seq = MAX(seq, (SELECT COALESCE(MAX(bill_id), 0) FROM bill_events))
+        WHERE name = 'bills'
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO sqlite_sequence (name, seq)
+        SELECT 'bills', MAX(bill_id) FROM bill_events
+        WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'bills')
+        HAVING MAX(bill_id) IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table(
+        "bills",
+        recreate="always",
+        table_kwargs={"sqlite_autoincrement": False},
+    ):
+        pass
+    for statement in SEARCH_TRIGGERS:
+        op.execute(statement)
@@ -0,0 +1,69 @@
+"""Time shell completion of bill names.
+
+Usage:
+    python -m benchmarks.bench_completion [VALUES]
+
+Writes a throwaway completion cache with VALUES names and recipients
+(default 10,000) and times one `search` completion request three ways: the
+cached lookup inside a running process, the `nmba` entry point answering
+from the cache, and the full CLI handling the same request (which imports
+SQLAlchemy, Apprise and Typer). The last two include interpreter startup.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNS = 5
+
+
+def run(env: dict, code: str) -> float:
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code], env=env, check=True, capture_output=True
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    values = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(
+            os.environ,
+            HOME=home,
+            _NMBA_COMPLETE="complete_bash",
+            COMP_WORDS="nmba search Bi",
+            COMP_CWORD="2",
+        )
+        os.environ["HOME"] = home
+        from nmba import completion
+
+        completion.CACHE_DIR = os.path.join(home, ".never_miss_a_bill_again")
+        completion.CACHE_PATH = os.path.join(completion.CACHE_DIR, "completions.json")
+        completion.write_cache(
+            {f"Bill {i}": 1 + i % 7 for i in range(values)},
+            {f"Biller {i}": 1 + i % 3 for i in range(values // 4)},
+        )
+
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            completion.matches("all", "Bi")
+        in_process = (time.perf_counter() - start) / RUNS
+
+        bare = run(env, "pass")
+        fast = run(env, "from nmba.completion import main; main()")
+        full = run(env, "from nmba.cli import app; app(prog_name='nmba')")
+
+    print(f"{'Cached lookup (in process)':<32} {in_process * 1000:7.1f} ms")
+    print(f"{'Python startup alone':<32} {bare * 1000:7.1f} ms")
+    print(f"{'nmba entry point (cache)':<32} {fast * 1000:7.1f} ms")
+    print(f"{'Full CLI completion':<32} {full * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
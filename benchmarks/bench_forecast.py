@@ -0,0 +1,90 @@
+"""Time the cashflow forecast over a large bills table.
+
+Usage:
+    python -m benchmarks.bench_forecast [BILLS] [RECIPIENTS]
+
+Builds a throwaway SQLite database with BILLS bills (default 100,000) spread
+over RECIPIENTS recipients (default 2,000) with a mix of schedules, then
+times a 12-month forecast grouped by month and by week.
+"""
+
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from nmba.data.forecast import forecast, schedule_periods
+from nmba.data.models import Base
+from nmba.data.schedule import add_months, refresh_due_dates
+
+SCHEDULES = [
+    ("monthly", 1),
+    ("monthly", 1),
+    ("monthly", 1),
+    ("monthly", 3),
+    ("yearly", 1),
+    ("weekly", 1),
+    ("weekly", 2),
+]
+
+
+def populate(conn, bills: int, recipients: int, today: datetime.date):
+    rng = random.Random(42)
+    rows = []
+    for i in range(bills):
+        frequency, interval = rng.choice(SCHEDULES)
+        anchor = today - datetime.timedelta(days=rng.randrange(400))
+        rows.append(
+            (
+                f"bill {i}",
+                f"Recipient {rng.randrange(recipients)}",
+                anchor.day,
+                round(rng.uniform(5, 500), 2),
+                0,
+                frequency,
+                interval,
+                anchor.isoformat(),
+            )
+        )
+    conn.exec_driver_sql(
+        "INSERT INTO bills (name, recipient, due_day, amount, paid, frequency, "
+        "interval, anchor_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def main():
+    bills = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    recipients = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    today = datetime.date.today()
+    end = add_months(today, 12) - datetime.timedelta(days=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            populate(conn, bills, recipients, today)
+        with Session(engine) as db:
+            start = time.perf_counter()
+            refresh_due_dates(db, today)
+            db.commit()
+            print(f"Computed next due dates in {time.perf_counter() - start:.3f}s")
+            for group_by in ("month", "week"):
+                for by_recipient in (True, False):
+                    schedule_periods.cache_clear()
+                    start = time.perf_counter()
+                    rows, _ = forecast(db, today, end, group_by, by_recipient)
+                    elapsed = time.perf_counter() - start
+                    print(
+                        f"12-month forecast by {group_by:<5} "
+                        f"{'and recipient' if by_recipient else 'only':<13} "
+                        f"{elapsed:.3f}s ({len(rows):,} rows)"
+                    )
+
+
+if __name__ == "__main__":
+    main()
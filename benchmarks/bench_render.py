@@ -0,0 +1,110 @@
+"""Time table output for a large bills table.
+
+Usage:
+    python -m benchmarks.bench_render [BILLS]
+
+Builds a throwaway SQLite database with BILLS bills (default 100,000) and
+compares building one full Rich table, streaming tab-separated rows (the
+non-terminal path) and rendering a single page (the paged terminal path).
+Output goes to an in-memory buffer.
+"""
+
+import datetime
+import io
+import os
+import sys
+import tempfile
+import time
+
+from rich.console import Console
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from benchmarks.bench_forecast import populate
+from nmba.data.models import Base, Bill
+from nmba.data.schedule import describe_schedule, refresh_due_dates
+from nmba.render import QueryRows, _build_table, stream_rows
+
+COLUMNS = [
+    ("ID", {"style": "cyan", "no_wrap": True}),
+    ("Name", {"style": "bold"}),
+    ("Recipient", {}),
+    ("Schedule", {}),
+    ("Next Due", {"justify": "right"}),
+    ("Amount", {"justify": "right"}),
+    ("Paid", {"justify": "center"}),
+]
+
+
+def bill_rows(db: Session) -> QueryRows:
+    return QueryRows(
+        db,
+        select(
+            Bill.id,
+            Bill.name,
+            Bill.recipient,
+            Bill.frequency,
+            Bill.interval,
+            Bill.due_day,
+            Bill.anchor_date,
+            Bill.next_due_date,
+            Bill.amount,
+            Bill.paid,
+        ).order_by(Bill.id),
+        lambda bill: (
+            str(bill.id),
+            bill.name,
+            bill.recipient,
+            describe_schedule(
+                bill.frequency, bill.interval, bill.due_day, bill.anchor_date
+            ),
+            str(bill.next_due_date),
+            f"${bill.amount:.2f}",
+            "✅" if bill.paid else "❌",
+        ),
+    )
+
+
+def timed(label: str, action):
+    start = time.perf_counter()
+    size = action()
+    print(f"{label:<28} {time.perf_counter() - start:.3f}s ({size:,} bytes)")
+
+
+def main():
+    bills = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    today = datetime.date.today()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            populate(conn, bills, 2_000, today)
+        with Session(engine) as db:
+            refresh_due_dates(db, today)
+            db.commit()
+
+            def full_table():
+                out = io.StringIO()
+                console = Console(file=out, force_terminal=True, width=120)
+                console.print(_build_table("Bills", COLUMNS, bill_rows(db)))
+                return len(out.getvalue())
+
+            def streamed():
+                out = io.StringIO()
+                stream_rows(Console(file=out), "Bills", COLUMNS, bill_rows(db))
+                return len(out.getvalue())
+
+            def one_page():
+                out = io.StringIO()
+                console = Console(file=out, force_terminal=True, width=120)
+                rows = bill_rows(db)
+                console.print(_build_table("Bills", COLUMNS, rows[0:40]))
+                return len(out.getvalue())
+
+            timed("Streamed (piped output)", streamed)
+            timed("One page (terminal pager)", one_page)
+            timed("Full Rich table", full_table)
+
+
+if __name__ == "__main__":
+    main()
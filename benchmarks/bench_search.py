@@ -0,0 +1,97 @@
+"""Compare FTS5 search latency against a LIKE '%x%' scan.
+
+Usage:
+    python -m benchmarks.bench_search [ROWS]
+
+Builds a throwaway SQLite database with ROWS bills (default 1,000,000),
+creates the search index and times both query strategies.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from nmba.data.models import Base
+from nmba.data.search import create_search_index, scan_bills, search_bills
+
+WORDS = [
+    "electric", "water", "gas", "internet", "phone", "rent", "mortgage",
+    "insurance", "gym", "streaming", "music", "cloud", "storage", "car",
+    "loan", "credit", "card", "tuition", "daycare", "parking", "netflix",
+    "spotify", "verizon", "comcast", "geico", "chase", "amex", "citi",
+]  # fmt: skip
+
+
+def populate(conn, rows: int):
+    rng = random.Random(42)
+    batch = []
+    for i in range(rows):
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+        recipient = f"{rng.choice(WORDS).title()} Co {rng.randrange(rows // 100 + 1)}"
+        batch.append((name, recipient, rng.randint(1, 31), rng.uniform(5, 500), 0))
+        if len(batch) == 50_000:
+            conn.exec_driver_sql(
+                "INSERT INTO bills (name, recipient, due_day, amount, paid) "
+                "VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+            batch.clear()
+    if batch:
+        conn.exec_driver_sql(
+            "INSERT INTO bills (name, recipient, due_day, amount, paid) "
+            "VALUES (?, ?, ?, ?, ?)",
+            batch,
+        )
+
+
+def timed(fn, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, len(result)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            populate(conn, rows)
+        print(f"Inserted {rows:,} bills in {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            create_search_index(conn)
+        print(f"Built search index in {time.perf_counter() - start:.2f}s\n")
+
+        with Session(engine) as db:
+            for query in [
+                "verizon",
+                "spot",
+                "geico insur",
+                "654321",
+                "co 4242",
+                "comcsat",
+            ]:
+                like, like_n = timed(lambda: scan_bills(db, query, limit=20))
+                fts, fts_n = timed(lambda: search_bills(db, query, limit=20))
+                fuzzy, fuzzy_n = timed(
+                    lambda: search_bills(db, query, fuzzy=True, limit=20)
+                )
+                print(
+                    f"{query!r:>14}  LIKE {like * 1000:8.2f}ms ({like_n})  "
+                    f"FTS {fts * 1000:8.2f}ms ({fts_n})  "
+                    f"fuzzy {fuzzy * 1000:8.2f}ms ({fuzzy_n})"
+                )
+
+
+if __name__ == "__main__":
+    main()
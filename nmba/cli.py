@@ -3,16 +3,71 @@
 import csv
 import datetime
 import functools
+import json
 import os
 
-import apprise
+import click
 import typer
 from rich.console import Console
 from rich.table import Table
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from nmba.data.database import SessionLocal
+from nmba.completion import (
+    complete_bills,
+    complete_names,
+    complete_recipients,
+    prompt_suggestions,
+    update_cache,
+    write_cache,
+)
+from nmba.data.backup import (
+    DEFAULT_RETENTION,
+    find_snapshot,
+    list_snapshots,
+    prune_snapshots,
+    restore_snapshot,
+    take_snapshot,
+)
+from nmba.data.database import SessionLocal, run_write
+from nmba.data.events import (
+    bill_state,
+    compact_history,
+    get_history,
+    record_all_created,
+    record_all_deleted,
+    record_all_paid,
+    record_created,
+    record_deleted,
+    record_updated,
+)
+from nmba.data.fx import (
+    base_currency,
+    converted_total,
+    format_amount,
+    parse_currency,
+    rate_cache,
+    read_rate_file,
+    store_rates,
+)
 from nmba.data.models import Bill, Config
+from nmba.data.schedule import (
+    add_months,
+    describe_schedule,
+    has_stale_due_dates,
+    needs_anchor,
+    parse_frequency,
+    refresh_due_dates,
+    schedule_bill,
+)
+from nmba.notifications import (
+    MODES,
+    TITLE_FIELDS,
+    bill_values,
+    compile_template,
+    send_to_target,
+)
+from nmba.render import QueryRows, render_table
 
 app = typer.Typer()
 console = Console()
@@ -38,44 +93,166 @@ def get_db():
         db.close()
 
 
+def refresh_schedules(db, today: datetime.date | None = None):
+    """Roll past due dates forward, taking the write lock only if any are stale."""
+    today = today or datetime.date.today()
+    if has_stale_due_dates(db, today):
+        run_write(lambda session: refresh_due_dates(session, today))
+
+
+def print_total(label: str, total: tuple):
+    """Print a (base currency, total, currencies without a rate) total."""
+    base, amount, missing = total
+    console.print(f"{label}: {format_amount(amount, base)}")
+    if missing:
+        console.print(
+            f"[yellow]Excludes bills in {', '.join(missing)}: no exchange rate. "
+            "Load rates with 'nmba import-rates'.[/yellow]"
+        )
+
+
+def rebuild_completions(db):
+    """Rewrite the completion cache of bill names and recipients from the database."""
+    write_cache(
+        dict(db.query(Bill.name, func.count()).group_by(Bill.name).all()),
+        dict(db.query(Bill.recipient, func.count()).group_by(Bill.recipient).all()),
+    )
+
+
+def update_completions(added=(), removed=()):
+    """Apply (name, recipient) pairs of added/removed bills to the completion cache."""
+    if not update_cache(added, removed):
+        rebuild_completions(next(get_db()))
+
+
+def snapshot_retention(db) -> int:
+    setting = db.query(Config).filter(Config.key == "snapshot_retention").first()
+    return int(setting.value) if setting else DEFAULT_RETENTION
+
+
+def snapshot_before(db, reason: str):
+    """Snapshot the database before a bulk/destructive change (skipped if unchanged)."""
+    if path := take_snapshot(reason, keep=snapshot_retention(db)):
+        console.print(f"[dim]Saved snapshot {os.path.basename(path)}[/dim]")
+
+
 # --- Notification/Config Commands ---
-def setup_apprise(db):
-    """Setup Apprise instance with notification targets."""
-    a = apprise.Apprise()
-    targets = db.query(Config).filter(Config.key == "notify_target").all()
-    for t in targets:
-        a.add(t.value)
-    return a
+def notify_options(db, url: str) -> dict:
+    """Per-target message settings (template, title, max_length, mode, link)."""
+    setting = db.query(Config).filter(Config.key == f"notify_options:{url}").first()
+    return json.loads(setting.value) if setting else {}
 
 
 @app.command()
 @concise_errors
-def config_set_notify_target(url: str):
-    """Set a notification target URL (Apprise). Run multiple times to add more."""
-    db = next(get_db())
-    db.add(Config(key="notify_target", value=url))
-    db.commit()
-    console.print(f"[green]Added notification target:[/green] {url}")
+def config_set_notify_target(
+    url: str,
+    template: str = typer.Option(
+        None,
+        help="Line per bill, e.g. '{name}: ${amount:.2f} on {due_date}'. "
+        "Fields: name, recipient, due_date, amount, schedule",
+    ),
+    title: str = typer.Option(
+        None, help="Message title, e.g. 'Bills due: {count}'. Fields: count, total"
+    ),
+    max_length: int = typer.Option(
+        None,
+        help="Maximum message length in characters (defaults to the service's limit)",
+    ),
+    mode: str = typer.Option(
+        None,
+        help="When bills do not fit: 'split' into several messages (default) "
+        "or send a 'digest'",
+    ),
+    link: str = typer.Option(None, help="Link added to digest messages"),
+):
+    """Set a notification target URL (Apprise). Run multiple times to add more.
+
+    Running it again for an existing target updates the message options given;
+    options left out keep their current values. Pass '' (0 for --max-length)
+    to reset one.
+    """
+    if mode and mode not in MODES:
+        raise ValueError(f"mode must be one of: {', '.join(MODES)}")
+    if template:
+        compile_template(template)
+    if title:
+        compile_template(title, TITLE_FIELDS)
+    changes = {
+        key: value
+        for key, value in (
+            ("template", template),
+            ("title", title),
+            ("max_length", max_length),
+            ("mode", mode),
+            ("link", link),
+        )
+        if value is not None
+    }
+
+    def apply(db):
+        exists = (
+            db.query(Config)
+            .filter(Config.key == "notify_target", Config.value == url)
+            .first()
+        )
+        if not exists:
+            db.add(Config(key="notify_target", value=url))
+        options = {**notify_options(db, url), **changes}
+        db.query(Config).filter(Config.key == f"notify_options:{url}").delete()
+        db.add(Config(key=f"notify_options:{url}", value=json.dumps(options)))
+        return exists is not None
+
+    exists = run_write(apply)
+    verb = "Updated" if exists else "Added"
+    console.print(f"[green]{verb} notification target:[/green] {url}")
 
 
 @app.command()
 @concise_errors
 def config_remove_notify_target(url: str):
     """Remove a notification target URL."""
-    db = next(get_db())
-    targets = db.query(Config).filter(Config.key == "notify_target").all()
 
-    if not targets:
+    def apply(db):
+        targets = db.query(Config).filter(Config.key == "notify_target").all()
+        if not targets:
+            return None
+        for t in targets:
+            if t.value == url:
+                db.delete(t)
+                db.query(Config).filter(Config.key == f"notify_options:{url}").delete()
+                return True
+        return False
+
+    removed = run_write(apply)
+    if removed is None:
         console.print("[yellow]No notification targets set.[/yellow]")
         raise typer.Exit(1)
+    if removed:
+        console.print(f"[green]Removed notification target:[/green] {url}")
+    else:
+        console.print(f"[red]No notification target found:[/red] {url}")
 
-    for t in targets:
-        if t.value == url:
-            db.delete(t)
-            db.commit()
-            console.print(f"[green]Removed notification target:[/green] {url}")
-            return
-    console.print(f"[red]No notification target found:[/red] {url}")
+
+@app.command()
+@concise_errors
+def config_set_snapshot_retention(
+    keep: int = typer.Argument(..., help="Number of snapshots to keep")
+):
+    """Set how many automatic/manual database snapshots to keep."""
+
+    def apply(db):
+        setting = db.query(Config).filter(Config.key == "snapshot_retention").first()
+        if setting:
+            setting.value = str(keep)
+        else:
+            db.add(Config(key="snapshot_retention", value=str(keep)))
+
+    run_write(apply)
+    removed = prune_snapshots(keep)
+    console.print(
+        f"[green]Keeping {keep} snapshot(s).[/green] Removed {removed} old snapshot(s)."
+    )
 
 
 @app.command()
@@ -85,7 +262,9 @@ def config_show():
     db = next(get_db())
     if targets := db.query(Config).filter(Config.key == "notify_target").all():
         for t in targets:
-            console.print(f"[cyan]{t.value}[/cyan]")
+            options = notify_options(db, t.value)
+            details = ", ".join(f"{key}={value!r}" for key, value in options.items())
+            console.print(f"[cyan]{t.value}[/cyan] {details}".rstrip())
     else:
         console.print("[yellow]No notification targets set.[/yellow]")
 
@@ -112,67 +291,143 @@ def notify(
     """
     db = next(get_db())
     today = datetime.date.today()
-    due_days = [(today.day + i - 1) % 31 + 1 for i in range(lookahead_days)]
-    bills = (
-        db.query(Bill)
-        .filter(
-            Bill.paid == False,  # pylint: disable=singleton-comparison
-            Bill.due_day.in_(due_days),
-        )
-        .all()
+    refresh_schedules(db, today)
+    due_soon = (
+        Bill.paid == False,  # pylint: disable=singleton-comparison
+        Bill.next_due_date >= today,
+        Bill.next_due_date < today + datetime.timedelta(days=lookahead_days),
     )
-    if not bills:
+    count = db.query(func.count(Bill.id)).filter(*due_soon).scalar()
+    if not count:
         console.print("[green]No bills due soon![/green]")
         return
-    table = Table(title="Upcoming Bills")
-    table.add_column("Name")
-    table.add_column("Recipient")
-    table.add_column("Due Day")
-    table.add_column("Amount")
-    for bill in bills:
-        table.add_row(
-            bill.name,
-            bill.recipient,
-            str(bill.due_day),
-            f"${bill.amount:.2f}",  # type: ignore
+    statement = (
+        select(
+            Bill.name,
+            Bill.recipient,
+            Bill.frequency,
+            Bill.interval,
+            Bill.due_day,
+            Bill.anchor_date,
+            Bill.next_due_date,
+            Bill.amount,
+            Bill.currency,
         )
-    total_due = sum(bill.amount for bill in bills)
+        .where(*due_soon)
+        .order_by(Bill.next_due_date, Bill.id)
+    )
     console.print("[yellow]Bills due soon:[/yellow]")
-    console.print(table)
-    console.print(f"Total: ${total_due:.2f}")
-    a = setup_apprise(db)
-    if bills:
-        msg = "\n".join(
-            [
-                f"{bill.name} to {bill.recipient} due on day {bill.due_day} for ${
-                    bill.amount:.2f
-                }"
-                for bill in bills
-            ]
-        )
-        a.notify(body=msg, title=f"Upcoming Bills Reminder (Total: ${total_due:.2f})")
-        console.print("[green]Notification sent via Apprise.[/green]")
+    render_table(
+        console,
+        "Upcoming Bills",
+        [("Name", {}), ("Recipient", {}), ("Due Date", {}), ("Amount", {})],
+        QueryRows(
+            db,
+            statement,
+            lambda bill: (
+                bill.name,
+                bill.recipient,
+                str(bill.next_due_date),
+                format_amount(bill.amount, bill.currency),
+            ),
+        ),
+        # Never wait on a keypress before the notifications go out
+        paginate=False,
+    )
+    total = converted_total(db, *due_soon)
+    print_total("Total", total)
+    base, total_due, missing = total
+    convert = rate_cache.converter(db)
+    bills = QueryRows(db, statement, lambda row: bill_values(row, convert))
+    for target in db.query(Config).filter(Config.key == "notify_target").all():
+        try:
+            sent, ok = send_to_target(
+                target.value,
+                notify_options(db, target.value),
+                bills,
+                count,
+                total_due,
+                base,
+                missing,
+            )
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            continue
+        if ok:
+            console.print(
+                f"[green]Notification sent via Apprise[/green] ({sent} message(s))."
+            )
+        else:
+            console.print(f"[red]Failed to notify {target.value}[/red]")
 
 
 # --- CRUD Commands ---
 @app.command()
 @concise_errors
-def add_bill():
-    """Add a new bill."""
-    db = next(get_db())
-    name = typer.prompt("Bill name")
-    recipient = typer.prompt("Recipient")
-    due_day = typer.prompt("Due day (1-31)", type=int)
+def add_bill(
+    frequency: str = typer.Option(
+        "monthly",
+        help="How often the bill repeats: daily, weekly, monthly, yearly "
+        "(or quarterly, biweekly, annual)",
+    ),
+    interval: int = typer.Option(1, help="Repeat every N periods of --frequency"),
+    currency: str = typer.Option(
+        None, help="Currency code, e.g. EUR (defaults to the base currency)"
+    ),
+    name: str = typer.Option(
+        None, help="Bill name (prompted if omitted)", autocompletion=complete_names
+    ),
+    recipient: str = typer.Option(
+        None,
+        help="Recipient (prompted if omitted)",
+        autocompletion=complete_recipients,
+    ),
+):
+    """Add a new bill. Bills repeat monthly unless --frequency/--interval say otherwise.
+
+    Press Tab at the name and recipient prompts to complete existing values.
+    """
+    frequency, interval = parse_frequency(frequency, interval)
+    currency = parse_currency(currency or base_currency(next(get_db())))
+    if name is None:
+        with prompt_suggestions("names"):
+            name = typer.prompt("Bill name")
+    if recipient is None:
+        with prompt_suggestions("recipients"):
+            recipient = typer.prompt("Recipient")
+    anchor_date = None
+    if needs_anchor(frequency, interval):
+        anchor_date = typer.prompt(
+            "First due date (YYYY-MM-DD)", type=click.DateTime(formats=["%Y-%m-%d"])
+        ).date()
+        due_day = anchor_date.day
+    else:
+        due_day = typer.prompt("Due day (1-31)", type=int)
     amount = typer.prompt("Amount", type=float)
-    bill = Bill(
-        name=name, recipient=recipient, due_day=due_day, amount=amount, paid=False
-    )
-    db.add(bill)
-    db.commit()
+
+    def apply(db):
+        bill = Bill(
+            name=name,
+            recipient=recipient,
+            due_day=due_day,
+            amount=amount,
+            paid=False,
+            frequency=frequency,
+            interval=interval,
+            anchor_date=anchor_date,
+            currency=currency,
+        )
+        schedule_bill(bill)
+        db.add(bill)
+        record_created(db, bill)
+        return bill.next_due_date
+
+    next_due_date = run_write(apply)
+    update_completions(added=[(name, recipient)])
     console.print(
-        f"[green]Added bill:[/green] {name} for {recipient} (due day {
-            due_day
-        }, amount ${amount:.2f})"
+        f"[green]Added bill:[/green] {name} for {recipient} ({
+            describe_schedule(frequency, interval, due_day, anchor_date)
+        }, next due {next_due_date}, amount {format_amount(amount, currency)})"
     )
 
 
@@ -180,54 +435,231 @@ def add_bill():
 @concise_errors
 def remove_bill(bill_id: int = typer.Argument(..., help="Bill ID to remove")):
     """Remove a bill by ID."""
-    db = next(get_db())
-    bill = db.query(Bill).filter(Bill.id == bill_id).first()
-    if not bill:
-        console.print(f"[red]No bill found with ID {bill_id}.[/red]")
-        raise typer.Exit(1)
-    db.delete(bill)
-    db.commit()
+
+    def apply(db):
+        bill = db.query(Bill).filter(Bill.id == bill_id).first()
+        if not bill:
+            console.print(f"[red]No bill found with ID {bill_id}.[/red]")
+            raise typer.Exit(1)
+        record_deleted(db, bill)
+        db.delete(bill)
+        return bill.name, bill.recipient
+
+    update_completions(removed=[run_write(apply)])
     console.print(f"[green]Removed bill with ID {bill_id}.[/green]")
 
 
 @app.command()
 @concise_errors
-def list_bills():
-    """List all bills in a table."""
+def list_bills(
+    pager: bool = typer.Option(
+        True, "--pager/--no-pager", help="Page through large tables on a terminal"
+    ),
+):
+    """List all bills in a table. Output is tab-separated when piped."""
     db = next(get_db())
-    bills = db.query(Bill).all()
-    table = Table(title="Bills")
+    refresh_schedules(db)
+    rows = QueryRows(
+        db,
+        select(
+            Bill.id,
+            Bill.name,
+            Bill.recipient,
+            Bill.frequency,
+            Bill.interval,
+            Bill.due_day,
+            Bill.anchor_date,
+            Bill.next_due_date,
+            Bill.amount,
+            Bill.currency,
+            Bill.paid,
+        ).order_by(Bill.id),
+        lambda bill: (
+            str(bill.id),
+            bill.name,
+            bill.recipient,
+            describe_schedule(
+                bill.frequency, bill.interval, bill.due_day, bill.anchor_date
+            ),
+            str(bill.next_due_date),
+            format_amount(bill.amount, bill.currency),
+            "✅" if bill.paid else "❌",
+        ),
+    )
+    total = converted_total(db)
+    console.print(f"Today's date: {datetime.date.today()}\n")
+    render_table(
+        console,
+        "Bills",
+        [
+            ("ID", {"style": "cyan", "no_wrap": True}),
+            ("Name", {"style": "bold"}),
+            ("Recipient", {}),
+            ("Schedule", {}),
+            ("Next Due", {"justify": "right"}),
+            ("Amount", {"justify": "right"}),
+            ("Paid", {"justify": "center"}),
+        ],
+        rows,
+        paginate=pager,
+    )
+    console.print()
+    print_total("Total", total)
+
+
+@app.command()
+@concise_errors
+def forecast(
+    months: int = typer.Option(
+        3, "--months", "-m", help="Forecast horizon in months (e.g. 3, 6, 12)"
+    ),
+    group_by: str = typer.Option(
+        "month", "--by", help="Group totals by 'week' or 'month'"
+    ),
+    by_recipient: bool = typer.Option(
+        True, "--by-recipient/--no-by-recipient", help="Break totals down by recipient"
+    ),
+    output: str = typer.Option("table", "--format", help="Output 'table' or 'json'"),
+    pager: bool = typer.Option(
+        True, "--pager/--no-pager", help="Page through large tables on a terminal"
+    ),
+):
+    """
+    Show what is due over the next N months, grouped by period and recipient.
+    Table output is tab-separated when piped.
+    Example usage:
+      nmba forecast --months 12 --by month
+      nmba forecast -m 3 --by week --format json
+    """
+    from nmba.data.forecast import forecast as build_forecast
+
+    if months < 1:
+        raise ValueError("--months must be at least 1")
+    if output not in ("table", "json"):
+        raise ValueError("--format must be 'table' or 'json'")
+    db = next(get_db())
+    today = datetime.date.today()
+    end = add_months(today, months) - datetime.timedelta(days=1)
+    refresh_schedules(db, today)
+    rows, missing = build_forecast(db, today, end, group_by, by_recipient)
+    base = base_currency(db)
+    grand_total = sum(total for *_, total in rows)
+
+    if output == "json":
+        typer.echo(
+            json.dumps(
+                {
+                    "start": today.isoformat(),
+                    "end": end.isoformat(),
+                    "group_by": group_by,
+                    "currency": base,
+                    "periods": [
+                        {
+                            "period": period.isoformat(),
+                            **({"recipient": who} if by_recipient else {}),
+                            "bills": occurrences,
+                            "total": round(total, 2),
+                        }
+                        for period, who, occurrences, total in rows
+                    ],
+                    "total": round(grand_total, 2),
+                    "excluded_currencies": missing,
+                },
+                indent=2,
+            )
+        )
+        return
+
+    columns = [("Week of" if group_by == "week" else "Month", {"style": "cyan"})]
+    if by_recipient:
+        columns.append(("Recipient", {}))
+    columns += [("Bills", {"justify": "right"}), ("Total", {"justify": "right"})]
+    render_table(
+        console,
+        f"Forecast {today} to {end}",
+        columns,
+        [
+            (
+                str(period) if group_by == "week" else f"{period:%Y-%m}",
+                *((who,) if by_recipient else ()),
+                str(occurrences),
+                format_amount(total, base),
+            )
+            for period, who, occurrences, total in rows
+        ],
+        paginate=pager,
+    )
+    print_total("\nTotal", (base, grand_total, missing))
+
+
+@app.command()
+@concise_errors
+def search(
+    query: str = typer.Argument(
+        ...,
+        help="Words to look for in bill names and recipients",
+        autocompletion=complete_bills,
+    ),
+    fuzzy: bool = typer.Option(
+        False, "--fuzzy", "-f", help="Match by trigram similarity (typo tolerant)"
+    ),
+    limit: int = typer.Option(20, "--limit", "-n", help="Maximum number of results"),
+):
+    """Search bills by name or recipient. Words match as prefixes, best match first."""
+    from nmba.data.search import has_search_index, scan_bills, search_bills
+
+    db = next(get_db())
+    if not has_search_index(db):
+        console.print(
+            "[yellow]Search index not found; falling back to a full scan. "
+            "Run 'alembic upgrade head' or 'nmba init' to create it.[/yellow]"
+        )
+        results = scan_bills(db, query, limit)
+    else:
+        results = search_bills(db, query, fuzzy=fuzzy, limit=limit)
+        if not results and not fuzzy:
+            results = search_bills(db, query, fuzzy=True, limit=limit)
+            if results:
+                console.print(
+                    "[yellow]No exact matches; showing fuzzy matches.[/yellow]"
+                )
+    if not results:
+        console.print(f"[yellow]No bills matching '{query}'.[/yellow]")
+        return
+    table = Table(title=f"Bills matching '{query}'")
     table.add_column("ID", style="cyan", no_wrap=True)
     table.add_column("Name", style="bold")
     table.add_column("Recipient")
     table.add_column("Due Day", justify="right")
     table.add_column("Amount", justify="right")
     table.add_column("Paid", justify="center")
-    for bill in bills:
+    for row in results:
         table.add_row(
-            str(bill.id),
-            bill.name,
-            bill.recipient,
-            str(bill.due_day),
-            f"${bill.amount:.2f}",
-            "✅" if bill.paid else "❌",
+            str(row.id),
+            row.name,
+            row.recipient,
+            str(row.due_day),
+            format_amount(row.amount, row.currency),
+            "✅" if row.paid else "❌",
         )
-    console.print(f"Today's date: {datetime.date.today()}\n")
     console.print(table)
-    console.print(f"\nTotal: ${sum(bill.amount for bill in bills):.2f}")
 
 
 @app.command()
 @concise_errors
 def mark_paid(bill_id: int = typer.Argument(..., help="Bill ID to mark as paid")):
     """Mark a bill as paid by ID."""
-    db: Session = next(get_db())
-    bill = db.query(Bill).filter(Bill.id == bill_id).first()
-    if not bill:
-        console.print(f"[red]No bill found with ID {bill_id}.[/red]")
-        raise typer.Exit(1)
-    bill.paid = True
-    db.commit()
+
+    def apply(db):
+        bill = db.query(Bill).filter(Bill.id == bill_id).first()
+        if not bill:
+            console.print(f"[red]No bill found with ID {bill_id}.[/red]")
+            raise typer.Exit(1)
+        before = bill_state(bill)
+        bill.paid = True
+        record_updated(db, bill, before)
+
+    run_write(apply)
     console.print(f"[green]Marked bill ID {bill_id} as paid.[/green]")
 
 
@@ -235,52 +667,100 @@ def mark_paid(bill_id: int = typer.Argument(..., help="Bill ID to mark as paid")
 @concise_errors
 def edit_bill(
     bill_id: int = typer.Argument(..., help="Bill ID to edit"),
-    name: str = typer.Option(None, help="New name"),
-    recipient: str = typer.Option(None, help="New recipient"),
+    name: str = typer.Option(None, help="New name", autocompletion=complete_names),
+    recipient: str = typer.Option(
+        None, help="New recipient", autocompletion=complete_recipients
+    ),
     due_day: int = typer.Option(None, help="New due day (1-31)"),
     amount: float = typer.Option(None, help="New amount"),
     paid: bool = typer.Option(None, help="Paid status (true/false)"),
+    frequency: str = typer.Option(
+        None, help="New frequency (daily, weekly, monthly, yearly, quarterly, ...)"
+    ),
+    interval: int = typer.Option(None, help="Repeat every N periods of frequency"),
+    anchor_date: datetime.datetime = typer.Option(
+        None, formats=["%Y-%m-%d"], help="Date of one due occurrence (YYYY-MM-DD)"
+    ),
+    currency: str = typer.Option(None, help="New currency code, e.g. EUR"),
 ):
     """Edit a bill by ID. Only specified fields are updated."""
-    db: Session = next(get_db())
-    bill = db.query(Bill).filter(Bill.id == bill_id).first()
-    if not bill:
-        console.print(f"[red]No bill found with ID {bill_id}.[/red]")
-        raise typer.Exit(1)
-    updated = False
-    if name is not None:
-        bill.name = name
-        updated = True
-    if recipient is not None:
-        bill.recipient = recipient
-        updated = True
-    if due_day is not None:
-        bill.due_day = due_day
-        updated = True
-    if amount is not None:
-        bill.amount = amount
-        updated = True
-    if paid is not None:
-        bill.paid = paid
-        updated = True
+    if currency is not None:
+        currency = parse_currency(currency)
+
+    def apply(db):
+        bill = db.query(Bill).filter(Bill.id == bill_id).first()
+        if not bill:
+            console.print(f"[red]No bill found with ID {bill_id}.[/red]")
+            raise typer.Exit(1)
+        before = bill_state(bill)
+        updated = False
+        if name is not None:
+            bill.name = name
+            updated = True
+        if recipient is not None:
+            bill.recipient = recipient
+            updated = True
+        if due_day is not None:
+            bill.due_day = due_day
+            updated = True
+        if amount is not None:
+            bill.amount = amount
+            updated = True
+        if paid is not None:
+            bill.paid = paid
+            updated = True
+        if currency is not None:
+            bill.currency = currency
+            updated = True
+        if frequency is not None or interval is not None:
+            bill.frequency, bill.interval = parse_frequency(
+                frequency or bill.frequency, 1 if interval is None else interval
+            )
+            updated = True
+        if anchor_date is not None:
+            bill.anchor_date = anchor_date.date()
+            if due_day is None:
+                bill.due_day = bill.anchor_date.day
+            updated = True
+        if needs_anchor(bill.frequency, bill.interval) and bill.anchor_date is None:
+            console.print(
+                f"[red]--anchor-date is required for {bill.frequency} bills.[/red]"
+            )
+            raise typer.Exit(1)
+        changes = {}
+        if updated:
+            schedule_bill(bill)
+            changes = record_updated(db, bill, before)
+        return (
+            bool(changes),
+            (before["name"], before["recipient"]),
+            (bill.name, bill.recipient),
+        )
+
+    updated, old, new = run_write(apply)
+    if old != new:
+        update_completions(added=[new], removed=[old])
     if updated:
-        db.commit()
         console.print(f"[green]Updated bill ID {bill_id}.[/green]")
     else:
-        console.print("[yellow]No fields updated.[/yellow]")
+        console.print("[yellow]No fields changed.[/yellow]")
 
 
 @app.command()
 @concise_errors
 def mark_unpaid(bill_id: int = typer.Argument(..., help="Bill ID to mark as unpaid")):
     """Mark a bill as unpaid by ID."""
-    db: Session = next(get_db())
-    bill = db.query(Bill).filter(Bill.id == bill_id).first()
-    if not bill:
-        console.print(f"[red]No bill found with ID {bill_id}.[/red]")
-        raise typer.Exit(1)
-    bill.paid = False
-    db.commit()
+
+    def apply(db):
+        bill = db.query(Bill).filter(Bill.id == bill_id).first()
+        if not bill:
+            console.print(f"[red]No bill found with ID {bill_id}.[/red]")
+            raise typer.Exit(1)
+        before = bill_state(bill)
+        bill.paid = False
+        record_updated(db, bill, before)
+
+    run_write(apply)
     console.print(f"[green]Marked bill ID {bill_id} as unpaid.[/green]")
 
 
@@ -289,8 +769,13 @@ def mark_unpaid(bill_id: int = typer.Argument(..., help="Bill ID to mark as unpa
 def mark_all_paid():
     """Mark ALL bills as paid."""
     db: Session = next(get_db())
-    updated = db.query(Bill).update({Bill.paid: True})
-    db.commit()
+    snapshot_before(db, "mark-all-paid")
+
+    def apply(db):
+        record_all_paid(db, True)
+        return db.query(Bill).filter(Bill.paid.is_not(True)).update({Bill.paid: True})
+
+    updated = run_write(apply)
     console.print(f"[green]Marked {updated} bill(s) as paid.[/green]")
 
 
@@ -299,8 +784,13 @@ def mark_all_paid():
 def mark_all_unpaid():
     """Mark ALL bills as unpaid."""
     db: Session = next(get_db())
-    updated = db.query(Bill).update({Bill.paid: False})
-    db.commit()
+    snapshot_before(db, "mark-all-unpaid")
+
+    def apply(db):
+        record_all_paid(db, False)
+        return db.query(Bill).filter(Bill.paid.is_not(False)).update({Bill.paid: False})
+
+    updated = run_write(apply)
     console.print(f"[green]Marked {updated} bill(s) as unpaid.[/green]")
 
 
@@ -309,11 +799,31 @@ def mark_all_unpaid():
 def remove_all_bills():
     """Remove all bills from the database."""
     db: Session = next(get_db())
-    deleted = db.query(Bill).delete()
-    db.commit()
+    snapshot_before(db, "remove-all-bills")
+
+    def apply(db):
+        record_all_deleted(db)
+        return db.query(Bill).delete()
+
+    deleted = run_write(apply)
+    rebuild_completions(db)
     console.print(f"[green]Removed {deleted} bill(s) from the database.[/green]")
 
 
+IMPORT_COLUMNS = (
+    "name",
+    "recipient",
+    "due_day",
+    "amount",
+    "paid",
+    "frequency",
+    "interval",
+    "anchor_date",
+    "currency",
+    "next_due_date",
+)
+
+
 @app.command()
 @concise_errors
 def import_csv(
@@ -322,17 +832,12 @@ def import_csv(
         False, "--overwrite", help="Delete all existing bills before import"
     ),
 ):
-    """Import bills from a CSV file. Required columns: name, recipient, due_day, amount. Optional: paid. Use --overwrite to clear all existing bills first."""
+    """Import bills from a CSV file. Required columns: name, recipient, due_day, amount. Optional: paid, frequency, interval, anchor_date, currency. Use --overwrite to clear all existing bills first."""
 
-    db: Session = next(get_db())
-    if overwrite:
-        deleted = db.query(Bill).delete()
-        db.commit()
-        console.print(
-            f"[yellow]Deleted {deleted} existing bill(s) before import.[/yellow]"
-        )
-    added = 0
+    added = []
     skipped = 0
+    today = datetime.date.today()
+    default_currency = base_currency(next(get_db()))
     with open(path, newline="", encoding="utf-8") as csvfile:
         reader = csv.DictReader(csvfile)
         required = {"name", "recipient", "due_day", "amount"}
@@ -346,21 +851,62 @@ def import_csv(
                 due_day = int(row["due_day"])
                 amount = float(row["amount"])
                 paid = str(row.get("paid", "")).strip().lower() in {"true", "1", "yes"}
-                db.add(
-                    Bill(
-                        name=name,
-                        recipient=recipient,
-                        due_day=due_day,
-                        amount=amount,
-                        paid=paid,
-                    )
+                frequency, interval = parse_frequency(
+                    row.get("frequency") or "monthly", int(row.get("interval") or 1)
+                )
+                anchor_date = (
+                    datetime.date.fromisoformat(row["anchor_date"].strip())
+                    if (row.get("anchor_date") or "").strip()
+                    else None
+                )
+                if needs_anchor(frequency, interval) and anchor_date is None:
+                    raise ValueError(f"anchor_date is required for {frequency} bills")
+                currency = parse_currency(row.get("currency") or default_currency)
+                bill = Bill(
+                    name=name,
+                    recipient=recipient,
+                    due_day=due_day,
+                    amount=amount,
+                    paid=paid,
+                    frequency=frequency,
+                    interval=interval,
+                    anchor_date=anchor_date,
+                    currency=currency,
+                )
+                schedule_bill(bill, today)
+                # Plain values, so a retried transaction starts from fresh objects
+                added.append(
+                    {column: getattr(bill, column) for column in IMPORT_COLUMNS}
                 )
-                added += 1
             except Exception as e:
                 skipped += 1
                 console.print(f"[yellow]Skipping row {i}: {e}[/yellow]")
-        db.commit()
-    console.print(f"[green]Imported {added} bill(s). Skipped {skipped} row(s).[/green]")
+
+    if overwrite:
+        snapshot_before(next(get_db()), "import-overwrite")
+
+    def apply(db):
+        deleted = 0
+        if overwrite:
+            record_all_deleted(db)
+            deleted = db.query(Bill).delete()
+        # Read inside the write transaction so concurrent imports cannot overlap
+        last_id = db.query(func.max(Bill.id)).scalar() or 0
+        db.add_all(Bill(**values) for values in added)
+        record_all_created(db, last_id)
+        return deleted
+
+    deleted = run_write(apply)
+    if overwrite:
+        rebuild_completions(next(get_db()))
+        console.print(
+            f"[yellow]Deleted {deleted} existing bill(s) before import.[/yellow]"
+        )
+    else:
+        update_completions(added=[(v["name"], v["recipient"]) for v in added])
+    console.print(
+        f"[green]Imported {len(added)} bill(s). Skipped {skipped} row(s).[/green]"
+    )
 
 
 @app.command()
@@ -368,12 +914,23 @@ def import_csv(
 def export_csv(
     path: str = typer.Argument(..., help="Path to write CSV file with bills"),
 ):
-    """Export all bills to a CSV file. Columns: name, recipient, due_day, amount, paid."""
+    """Export all bills to a CSV file. Columns: name, recipient, due_day, amount, paid, frequency, interval, anchor_date, currency."""
     db: Session = next(get_db())
     bills = db.query(Bill).all()
     with open(path, "w", newline="", encoding="utf-8") as csvfile:
         writer = csv.DictWriter(
-            csvfile, fieldnames=["name", "recipient", "due_day", "amount", "paid"]
+            csvfile,
+            fieldnames=[
+                "name",
+                "recipient",
+                "due_day",
+                "amount",
+                "paid",
+                "frequency",
+                "interval",
+                "anchor_date",
+                "currency",
+            ],
         )
         writer.writeheader()
         for bill in bills:
@@ -384,11 +941,176 @@ def export_csv(
                     "due_day": bill.due_day,
                     "amount": f"{bill.amount:.2f}",
                     "paid": str(bool(bill.paid)),
+                    "frequency": bill.frequency,
+                    "interval": bill.interval,
+                    "anchor_date": bill.anchor_date or "",
+                    "currency": bill.currency,
                 }
             )
     console.print(f"[green]Exported {len(bills)} bill(s) to {path}.[/green]")
 
 
+@app.command()
+@concise_errors
+def import_rates(
+    path: str = typer.Argument(..., help="CSV file with columns currency, date, rate"),
+    base: str = typer.Option(
+        None, help="Currency the rates are quoted in (defaults to the current base)"
+    ),
+):
+    """Load exchange rates from a local CSV file; no network access is needed.
+
+    Each row gives the value of one unit of `currency` in the base currency on
+    `date` (YYYY-MM-DD). Totals use the latest rate on or before the report
+    date. Existing rates for the same currency and date are replaced; a
+    different --base replaces all rates.
+    """
+    rows = read_rate_file(path)
+    base = parse_currency(base or base_currency(next(get_db())))
+    loaded = run_write(lambda db: store_rates(db, rows, base))
+    console.print(f"[green]Loaded {loaded} rate(s) quoted in {base}.[/green]")
+
+
+@app.command()
+@concise_errors
+def rates():
+    """Show the base currency and the latest exchange rate per currency."""
+    db = next(get_db())
+    base, latest = rate_cache.get(db)
+    console.print(f"Base currency: [cyan]{base}[/cyan]")
+    if not latest:
+        console.print("[yellow]No exchange rates loaded.[/yellow]")
+        return
+    table = Table(title="Exchange Rates")
+    table.add_column("Currency", style="cyan")
+    table.add_column(f"Value in {base}", justify="right")
+    for currency, rate in sorted(latest.items()):
+        table.add_row(currency, f"{rate:.6g}")
+    console.print(table)
+
+
+@app.command()
+@concise_errors
+def history(
+    bill_id: int = typer.Argument(None, help="Only show changes to this bill"),
+    since: datetime.datetime = typer.Option(
+        None, formats=["%Y-%m-%d", "%Y-%m-%d %H:%M"], help="Only show changes since"
+    ),
+    limit: int = typer.Option(50, "--limit", "-n", help="Maximum number of events"),
+):
+    """Show who changed which bills and when, most recent first."""
+    db: Session = next(get_db())
+    events = get_history(db, bill_id, since, limit)
+    if not events:
+        console.print("[yellow]No history found.[/yellow]")
+        return
+    table = Table(title="Bill History")
+    table.add_column("When", style="cyan", no_wrap=True)
+    table.add_column("Bill", justify="right")
+    table.add_column("Event")
+    table.add_column("Actor")
+    table.add_column("Changes")
+    for event in events:
+        changes = json.loads(event.changes)
+        if event.event == "updated":
+            summary = ", ".join(
+                f"{field}: {old} → {new}" for field, (old, new) in changes.items()
+            )
+        else:
+            summary = ", ".join(f"{field}={value}" for field, value in changes.items())
+        table.add_row(
+            f"{event.created_at:%Y-%m-%d %H:%M:%S}",
+            str(event.bill_id),
+            event.event,
+            event.actor,
+            summary,
+        )
+    console.print(table)
+
+
+@app.command("compact-history")
+@concise_errors
+def compact_history_command(
+    older_than: int = typer.Option(
+        90, "--older-than", help="Fold events older than this many days"
+    ),
+):
+    """Fold each bill's old history into a single snapshot event to save space."""
+    db: Session = next(get_db())
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=older_than)
+    snapshot_before(db, "compact-history")
+    removed, snapshots = run_write(lambda db: compact_history(db, cutoff))
+    console.print(
+        f"[green]Folded {removed} event(s) into {snapshots} snapshot(s).[/green]"
+    )
+
+
+@app.command()
+@concise_errors
+def snapshot(
+    reason: str = typer.Option("manual", help="Label stored in the snapshot name"),
+):
+    """Save a snapshot of the database now."""
+    db: Session = next(get_db())
+    path = take_snapshot(reason, keep=snapshot_retention(db), force=True)
+    if not path:
+        console.print("[yellow]Database not found. Run 'nmba init' first.[/yellow]")
+        raise typer.Exit(1)
+    console.print(f"[green]Saved snapshot {os.path.basename(path)}[/green]")
+
+
+@app.command()
+@concise_errors
+def restore(
+    name: str = typer.Argument(
+        None, help="Snapshot file name (or 'latest'). Omit to list snapshots."
+    ),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Do not ask for confirmation"),
+):
+    """List database snapshots, or restore one.
+    Snapshots are taken automatically before bulk changes (mark-all-paid,
+    mark-all-unpaid, remove-all-bills, import-csv --overwrite, compact-history)
+    and before a restore.
+    """
+    if name is None:
+        snapshots = list_snapshots()
+        if not snapshots:
+            console.print("[yellow]No snapshots found.[/yellow]")
+            return
+        table = Table(title="Snapshots")
+        table.add_column("Name", style="cyan", no_wrap=True)
+        table.add_column("Taken")
+        table.add_column("Reason")
+        table.add_column("Size", justify="right")
+        for s in snapshots:
+            table.add_row(
+                s["name"],
+                f"{s['created']:%Y-%m-%d %H:%M:%S}",
+                s["reason"],
+                f"{s['size'] / 1024:.0f} KiB",
+            )
+        console.print(table)
+        return
+
+    found = find_snapshot(name)
+    if not found:
+        console.print(f"[red]No snapshot found:[/red] {name}")
+        raise typer.Exit(1)
+    if not yes and not typer.confirm(
+        f"Replace the current database with {found['name']}?"
+    ):
+        console.print("[yellow]Restore cancelled.[/yellow]")
+        return
+    db: Session = next(get_db())
+    keep = snapshot_retention(db)
+    db.close()
+    # Keep one more than usual so the snapshot being restored is not pruned
+    take_snapshot("pre-restore", keep=keep + 1, force=True)
+    restore_snapshot(found["path"])
+    rebuild_completions(next(get_db()))
+    console.print(f"[green]Restored database from {found['name']}.[/green]")
+
+
 @app.command()
 @concise_errors
 def version():
@@ -414,9 +1136,13 @@ def init():
     """Initialize the database in ~/.never_miss_a_bill_again/nmba.db"""
     from nmba.data.database import DB_DIR, DB_PATH, engine
     from nmba.data.models import Base
+    from nmba.data.search import create_search_index
 
     os.makedirs(DB_DIR, exist_ok=True)
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        create_search_index(conn)
+    rebuild_completions(next(get_db()))
     console.print(f"[green]Initialized database at {DB_PATH}[/green]")
 
 
@@ -0,0 +1,239 @@
+"""Fast completion of bill names and recipients.
+
+Distinct names and recipients are kept, with how many bills use each, in a
+small JSON file next to the database. Commands that add, rename or remove
+bills update the counts in place; bulk changes rebuild the file.
+
+Shell completion normally starts the whole CLI, importing SQLAlchemy,
+Apprise and Typer just to print a few words. `main` is the console entry
+point: when the shell asks for a name or recipient it answers straight from
+the cache, and anything else falls through to the full CLI. This module must
+only import the standard library.
+"""
+
+import contextlib
+import json
+import os
+import shlex
+import sys
+
+# Same directory as nmba.data.database.DB_DIR, without importing SQLAlchemy
+CACHE_DIR = os.path.expanduser("~/.never_miss_a_bill_again")
+CACHE_PATH = os.path.join(CACHE_DIR, "completions.json")
+COMPLETE_VAR = "_NMBA_COMPLETE"
+MAX_MATCHES = 50
+
+# (command, option) pairs whose values are bill names or recipients
+_VALUE_OPTIONS = {
+    ("add-bill", "--name"): "names",
+    ("add-bill", "--recipient"): "recipients",
+    ("edit-bill", "--name"): "names",
+    ("edit-bill", "--recipient"): "recipients",
+}
+# Options of `search` that take a value, so the word after them is not the query
+_SEARCH_VALUE_OPTIONS = {"--limit", "-n"}
+
+
+def load_cache() -> dict:
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(cache: dict):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{CACHE_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp, CACHE_PATH)
+
+
+@contextlib.contextmanager
+def _locked():
+    """Serialize read-modify-write of the cache across processes."""
+    try:
+        import fcntl
+    except ImportError:  # Windows: last writer wins
+        yield
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(f"{CACHE_PATH}.lock", "w", encoding="utf-8") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def write_cache(names: dict[str, int], recipients: dict[str, int]):
+    """Replace the cache with full {value: bill count} maps."""
+    with _locked():
+        _save({"names": names, "recipients": recipients})
+
+
+def update_cache(added=(), removed=()) -> bool:
+    """Apply (name, recipient) pairs of added and removed bills.
+
+    Returns False without writing if there is no cache yet, so the caller
+    can build it from the database instead.
+    """
+    with _locked():
+        if not (cache := load_cache()):
+            return False
+        for pairs, step in ((added, 1), (removed, -1)):
+            for pair in pairs:
+                for kind, value in zip(("names", "recipients"), pair):
+                    counts = cache.setdefault(kind, {})
+                    if (count := counts.get(value, 0) + step) > 0:
+                        counts[value] = count
+                    else:
+                        counts.pop(value, None)
+        _save(cache)
+    return True
+
+
+def matches(kind: str, incomplete: str = "", cache: dict | None = None) -> list[str]:
+    """Cached values starting with `incomplete` (case-insensitive), most used first.
+
+    `kind` is "names", "recipients" or "all".
+    """
+    cache = load_cache() if cache is None else cache
+    counts: dict[str, int] = {}
+    for key in ("names", "recipients") if kind == "all" else (kind,):
+        for value, count in cache.get(key, {}).items():
+            counts[value] = counts.get(value, 0) + count
+    prefix = incomplete.casefold()
+    found = [value for value in counts if value.casefold().startswith(prefix)]
+    found.sort(key=lambda value: (-counts[value], value.casefold()))
+    return found[:MAX_MATCHES]
+
+
+def complete_names(incomplete: str) -> list[str]:
+    return matches("names", incomplete)
+
+
+def complete_recipients(incomplete: str) -> list[str]:
+    return matches("recipients", incomplete)
+
+
+def complete_bills(incomplete: str) -> list[str]:
+    return matches("all", incomplete)
+
+
+@contextlib.contextmanager
+def prompt_suggestions(kind: str):
+    """Tab-complete cached values at an interactive prompt (via readline)."""
+    try:
+        import readline
+    except ImportError:
+        yield
+        return
+    values = matches(kind)
+    previous = (readline.get_completer(), readline.get_completer_delims())
+
+    def complete(text: str, state: int):
+        options = [
+            value for value in values if value.casefold().startswith(text.casefold())
+        ]
+        return options[state] if state < len(options) else None
+
+    readline.set_completer(complete)
+    # Names often contain spaces: complete the whole line, not the last word
+    readline.set_completer_delims("")
+    readline.parse_and_bind("tab: complete")
+    try:
+        yield
+    finally:
+        readline.set_completer(previous[0])
+        readline.set_completer_delims(previous[1])
+
+
+def _split(line: str) -> list[str]:
+    try:
+        return shlex.split(line)
+    except ValueError:  # unfinished quote in the word being completed
+        return shlex.split(line + '"') if line.count('"') % 2 else line.split()
+
+
+def _completion_args(shell: str) -> tuple[list[str], str]:
+    """(words before the cursor, word being completed), as Typer reads them."""
+    if shell == "bash":
+        words = _split(os.environ.get("COMP_WORDS", ""))
+        cword = int(os.environ.get("COMP_CWORD", len(words)))
+        return words[1:cword], words[cword] if cword < len(words) else ""
+    line = os.environ.get("_TYPER_COMPLETE_ARGS", "")
+    words = _split(line)[1:]
+    if shell in ("powershell", "pwsh"):
+        incomplete = os.environ.get("_TYPER_COMPLETE_WORD_TO_COMPLETE", "")
+        return (words[:-1] if incomplete else words), incomplete
+    if words and not line.endswith(" "):
+        return words[:-1], words[-1]
+    return words, ""
+
+
+def _value_kind(args: list[str], incomplete: str) -> str | None:
+    """Which cached values complete this position, or None to defer to the CLI."""
+    if not args or incomplete.startswith("-"):
+        return None
+    command = args[0]
+    if (kind := _VALUE_OPTIONS.get((command, args[-1]))) is not None:
+        return kind
+    if command == "search":
+        positional = [
+            word
+            for i, word in enumerate(args[1:], 1)
+            if not word.startswith("-") and args[i - 1] not in _SEARCH_VALUE_OPTIONS
+        ]
+        if not positional and args[-1] not in _SEARCH_VALUE_OPTIONS:
+            return "all"
+    return None
+
+
+def _zsh_escape(value: str) -> str:
+    return (
+        value.replace('"', '""')
+        .replace("'", "''")
+        .replace("$", "\\$")
+        .replace("`", "\\`")
+        .replace(":", r"\\:")
+    )
+
+
+def fast_complete(shell: str) -> str | None:
+    """Output for the shell's completion request, or None if the full CLI
+    must answer it. Output formats match Typer's completion classes."""
+    args, incomplete = _completion_args(shell)
+    if (kind := _value_kind(args, incomplete)) is None:
+        return None
+    values = matches(kind, incomplete)
+    if shell == "bash":
+        return "\n".join(values)
+    if shell == "zsh":
+        if not values:
+            return "_files"
+        options = "\n".join(f'"{_zsh_escape(value)}"' for value in values)
+        return f"_arguments '*: :(({options}))'"
+    if shell == "fish":
+        if os.environ.get("_TYPER_COMPLETE_FISH_ACTION") == "is-args":
+            sys.exit(0 if values else 1)
+        return "\n".join(values)
+    if shell in ("powershell", "pwsh"):
+        return "\n".join(f"{value}::: " for value in values)
+    return None
+
+
+def main():
+    """Console entry point for `nmba`."""
+    instruction = os.environ.get(COMPLETE_VAR, "")
+    if instruction.startswith("complete_"):
+        output = fast_complete(instruction.removeprefix("complete_"))
+        if output is not None:
+            sys.stdout.write(output)
+            return
+
+    from nmba.cli import app
+
+    app(prog_name="nmba")
+
+
+if __name__ == "__main__":
+    main()
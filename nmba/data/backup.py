@@ -0,0 +1,117 @@
+"""Point-in-time snapshots of the database using SQLite's online backup API."""
+
+import datetime
+import os
+import re
+import sqlite3
+
+from .database import BUSY_TIMEOUT, DB_DIR, DB_PATH
+
+SNAPSHOT_DIR = os.path.join(DB_DIR, "snapshots")
+DEFAULT_RETENTION = 10
+
+_FINGERPRINT_FILE = os.path.join(SNAPSHOT_DIR, ".fingerprint")
+_NAME_RE = re.compile(r"^nmba-(\d{8}T\d{6}\d{6})-([\w-]+)\.db$")
+
+
+def fingerprint(path: str | None = None) -> str:
+    """Cheap token that changes whenever the database file is written.
+
+    PRAGMA data_version only detects changes made by other connections while
+    a connection stays open, so it cannot be compared across runs. Instead
+    this reads the file change counter SQLite keeps in the database header
+    (bumped on every committed write in rollback-journal mode) plus the size
+    and mtime of the file and of any WAL file.
+    """
+    path = path or DB_PATH
+    with open(path, "rb") as db_file:
+        header = db_file.read(28)
+    parts = [header[24:28].hex()]
+    for name in (path, f"{path}-wal"):
+        if os.path.exists(name):
+            stat = os.stat(name)
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+    return "/".join(parts)
+
+
+def _copy(source: str, target: str):
+    src = sqlite3.connect(source, timeout=BUSY_TIMEOUT)
+    dst = sqlite3.connect(target, timeout=BUSY_TIMEOUT)
+    try:
+        with dst:
+            src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def list_snapshots() -> list[dict]:
+    """Snapshots on disk, newest first."""
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return []
+    snapshots = []
+    for name in os.listdir(SNAPSHOT_DIR):
+        if match := _NAME_RE.match(name):
+            path = os.path.join(SNAPSHOT_DIR, name)
+            snapshots.append(
+                {
+                    "name": name,
+                    "path": path,
+                    "created": datetime.datetime.strptime(
+                        match.group(1), "%Y%m%dT%H%M%S%f"
+                    ),
+                    "reason": match.group(2),
+                    "size": os.path.getsize(path),
+                }
+            )
+    return sorted(snapshots, key=lambda s: s["created"], reverse=True)
+
+
+def prune_snapshots(keep: int) -> int:
+    """Delete all but the newest `keep` snapshots. Returns how many were removed."""
+    stale = list_snapshots()[max(keep, 0) :]
+    for snapshot in stale:
+        os.remove(snapshot["path"])
+    return len(stale)
+
+
+def take_snapshot(
+    reason: str, keep: int = DEFAULT_RETENTION, force: bool = False
+) -> str | None:
+    """Copy the live database into the snapshot directory.
+
+    Skipped (returning None) when the database has not changed since the
+    last snapshot, unless `force` is set. Old snapshots beyond `keep` are
+    pruned. Returns the new snapshot's path.
+    """
+    if not os.path.exists(DB_PATH):
+        return None
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    current = fingerprint()
+    if not force and os.path.exists(_FINGERPRINT_FILE) and list_snapshots():
+        with open(_FINGERPRINT_FILE, encoding="utf-8") as f:
+            if f.read() == current:
+                return None
+
+    slug = re.sub(r"[^\w-]+", "-", reason).strip("-") or "manual"
+    stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    path = os.path.join(SNAPSHOT_DIR, f"nmba-{stamp}-{slug}.db")
+    _copy(DB_PATH, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    with open(_FINGERPRINT_FILE, "w", encoding="utf-8") as f:
+        f.write(current)
+    prune_snapshots(keep)
+    return path
+
+
+def find_snapshot(name: str) -> dict | None:
+    """Look up a snapshot by file name, or "latest"."""
+    snapshots = list_snapshots()
+    if name == "latest":
+        return snapshots[0] if snapshots else None
+    return next((s for s in snapshots if s["name"] == name), None)
+
+
+def restore_snapshot(path: str):
+    """Overwrite the live database with a snapshot, page by page, under a lock."""
+    _copy(path, DB_PATH)
@@ -1,6 +1,9 @@
 import os
+import random
+import time
 
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -9,8 +12,15 @@ DB_DIR = os.path.expanduser("~/.never_miss_a_bill_again")
 DB_PATH = os.path.join(DB_DIR, "nmba.db")
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
+# Cron jobs and interactive commands share the file: wait this many seconds
+# for another process's lock before SQLite reports "database is locked"
+BUSY_TIMEOUT = 15
+WRITE_RETRIES = 5
+RETRY_BACKOFF = 0.1  # seconds, doubled after each failed attempt
+
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False, "timeout": BUSY_TIMEOUT},
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -22,3 +32,36 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def is_locked(error: Exception) -> bool:
+    return isinstance(error, OperationalError) and any(
+        reason in str(error.orig) for reason in ("database is locked", "busy")
+    )
+
+
+def run_write(work, session_factory=None, retries: int = WRITE_RETRIES):
+    """Run `work(db)` in its own write transaction and commit.
+
+    The transaction starts with BEGIN IMMEDIATE, so the write lock is taken
+    before anything is read and two processes can never both read a row and
+    then overwrite each other's change. If the lock cannot be had within the
+    busy timeout, the whole transaction is rolled back and retried after a
+    jittered, growing pause. Returns whatever `work` returns.
+    """
+    attempt = 0
+    while True:
+        db = (session_factory or SessionLocal)()
+        try:
+            db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+            result = work(db)
+            db.commit()
+            return result
+        except OperationalError as e:
+            db.rollback()
+            if attempt >= retries or not is_locked(e):
+                raise
+        finally:
+            db.close()
+        time.sleep(random.uniform(0, RETRY_BACKOFF * 2**attempt))
+        attempt += 1
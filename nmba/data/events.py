@@ -0,0 +1,230 @@
+"""Audit log of bill changes, written in the same transaction as the change."""
+
+import datetime
+import getpass
+import json
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.orm import Session
+
+from .models import Bill, BillEvent
+
+TRACKED_FIELDS = (
+    "name",
+    "recipient",
+    "due_day",
+    "amount",
+    "paid",
+    "frequency",
+    "interval",
+    "anchor_date",
+    "currency",
+)
+
+# Same shape as bill_state(), built by SQLite for bulk INSERT ... SELECT
+_STATE_JSON = """json_object(
+    'name', name, 'recipient', recipient, 'due_day', due_day,
+    'amount', amount, 'paid', json(CASE WHEN paid THEN 'true' ELSE 'false' END),
+    'frequency', frequency, 'interval', interval, 'anchor_date', anchor_date,
+    'currency', currency
+)"""
+
+_PAID_CHANGE_JSON = """json_object('paid', json_array(
+    json(CASE WHEN paid THEN 'true' ELSE 'false' END), json(:paid_json)
+))"""
+
+
+def current_actor() -> str:
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "unknown"
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now()
+
+
+def _json_value(value):
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def bill_state(bill: Bill) -> dict:
+    return {field: _json_value(getattr(bill, field)) for field in TRACKED_FIELDS}
+
+
+def _event(bill_id: int, event: str, changes: dict) -> BillEvent:
+    return BillEvent(
+        bill_id=bill_id,
+        event=event,
+        changes=json.dumps(changes),
+        actor=current_actor(),
+        created_at=_now(),
+    )
+
+
+def record_created(db: Session, bill: Bill):
+    """Log a new bill. Flushes so the bill has an id."""
+    db.flush()
+    db.add(_event(bill.id, "created", bill_state(bill)))
+
+
+def record_updated(db: Session, bill: Bill, before: dict) -> dict:
+    """Log the fields of `bill` that differ from the `before` state.
+
+    Returns the {field: [old, new]} changes; nothing is logged if empty.
+    """
+    after = bill_state(bill)
+    changes = {
+        field: [before[field], after[field]]
+        for field in TRACKED_FIELDS
+        if before[field] != after[field]
+    }
+    if changes:
+        db.add(_event(bill.id, "updated", changes))
+    return changes
+
+
+def record_deleted(db: Session, bill: Bill):
+    db.add(_event(bill.id, "deleted", bill_state(bill)))
+
+
+def _bulk_insert(db: Session, select_sql: str, params: dict):
+    statement = text(
+        "INSERT INTO bill_events (bill_id, event, changes, actor, created_at) "
+        + select_sql
+    ).bindparams(bindparam("at", type_=DateTime))
+    db.execute(statement, {"actor": current_actor(), "at": _now(), **params})
+
+
+def record_all_paid(db: Session, paid: bool):
+    """Log a paid-status change for every bill whose status differs from `paid`.
+
+    One INSERT ... SELECT, so bulk updates cost a single extra statement.
+    """
+    _bulk_insert(
+        db,
+        f"SELECT id, 'updated', {_PAID_CHANGE_JSON}, :actor, :at FROM bills "
+        "WHERE paid IS NOT :paid",
+        {"paid": paid, "paid_json": json.dumps(paid)},
+    )
+
+
+def record_all_deleted(db: Session):
+    """Log the deletion of every bill, ahead of a bulk DELETE."""
+    _bulk_insert(db, f"SELECT id, 'deleted', {_STATE_JSON}, :actor, :at FROM bills", {})
+
+
+def record_all_created(db: Session, after_id: int):
+    """Log every bill with an id above `after_id` as created (e.g. after an import)."""
+    db.flush()
+    _bulk_insert(
+        db,
+        f"SELECT id, 'created', {_STATE_JSON}, :actor, :at FROM bills "
+        "WHERE id > :after_id",
+        {"after_id": after_id},
+    )
+
+
+def get_history(
+    db: Session,
+    bill_id: int | None = None,
+    since: datetime.datetime | None = None,
+    limit: int = 50,
+) -> list[BillEvent]:
+    """Most recent events first, optionally for one bill and/or since a time."""
+    query = db.query(BillEvent)
+    if bill_id is not None:
+        query = query.filter(BillEvent.bill_id == bill_id)
+    if since is not None:
+        query = query.filter(BillEvent.created_at >= since)
+    return (
+        query.order_by(BillEvent.created_at.desc(), BillEvent.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def fold(state: dict | None, event: str, changes: dict) -> dict:
+    """Apply one event to a bill state, returning the new state."""
+    if event in ("created", "snapshot"):
+        return dict(changes)
+    if event == "deleted":
+        return {**changes, "deleted": True}
+    state = dict(state or {})
+    for field, (_, new) in changes.items():
+        state[field] = new
+    return state
+
+
+def compact_history(db: Session, before: datetime.datetime) -> tuple[int, int]:
+    """Fold each bill's events older than `before` into a single snapshot.
+
+    A "deleted" event ends a bill's history: databases from before bill ids
+    were made AUTOINCREMENT may have reused the id for a later bill, so
+    the events up to each deletion are folded separately, keeping who
+    deleted the bill. Runs of only one old event are left alone. Returns
+    (events removed, snapshots written). The caller commits.
+    """
+    stale = (
+        "SELECT bill_id FROM bill_events WHERE created_at < :before "
+        "GROUP BY bill_id HAVING COUNT(*) > 1"
+    )
+    rows = db.execute(
+        text(
+            "SELECT id, bill_id, event, changes, actor, created_at FROM bill_events "
+            f"WHERE created_at < :before AND bill_id IN ({stale}) "
+            "ORDER BY bill_id, created_at, id"
+        ).bindparams(bindparam("before", type_=DateTime)),
+        {"before": before},
+    )
+    removed, snapshots = [], []
+    for run in _runs(rows):
+        if len(run) < 2:
+            continue
+        state = None
+        for row in run:
+            state = fold(state, row.event, json.loads(row.changes))
+        removed.extend({"id": row.id} for row in run)
+        snapshots.append(
+            _snapshot(run[0].bill_id, state, (run[-1].actor, run[-1].created_at))
+        )
+    if not snapshots:
+        return 0, 0
+
+    db.execute(text("DELETE FROM bill_events WHERE id = :id"), removed)
+    db.execute(
+        text(
+            "INSERT INTO bill_events (bill_id, event, changes, actor, created_at) "
+            "VALUES (:bill_id, 'snapshot', :changes, :actor, :created_at)"
+        ),
+        snapshots,
+    )
+    return len(removed), len(snapshots)
+
+
+def _runs(rows):
+    """Split events ordered by bill id into runs, each ending at a deletion."""
+    run = []
+    for row in rows:
+        if run and row.bill_id != run[-1].bill_id:
+            yield run
+            run = []
+        run.append(row)
+        if row.event == "deleted":
+            yield run
+            run = []
+    if run:
+        yield run
+
+
+def _snapshot(bill_id: int, state: dict, last: tuple) -> dict:
+    actor, created_at = last
+    return {
+        "bill_id": bill_id,
+        "changes": json.dumps(state),
+        "actor": actor,
+        "created_at": created_at,
+    }
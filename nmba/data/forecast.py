@@ -0,0 +1,204 @@
+"""Cashflow forecast: scheduled bill totals per period and recipient."""
+
+import datetime
+import functools
+from collections import defaultdict
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .fx import rate_cache
+from .schedule import month_day
+
+GROUP_BY = ("week", "month")
+
+
+def period_start(day: datetime.date, group_by: str) -> datetime.date:
+    if group_by == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+@functools.lru_cache(maxsize=4096)
+def schedule_periods(
+    frequency: str,
+    interval: int,
+    due_day: int,
+    first_due: datetime.date,
+    end: datetime.date,
+    group_by: str,
+) -> tuple[tuple[datetime.date, int], ...]:
+    """Occurrences of a schedule from `first_due` through `end`, counted per period.
+
+    Cached per schedule, so bills sharing a schedule are expanded only once.
+    """
+    counts: dict[datetime.date, int] = defaultdict(int)
+    if frequency in ("daily", "weekly"):
+        step = datetime.timedelta(days=interval * (7 if frequency == "weekly" else 1))
+        day = first_due
+        while day <= end:
+            counts[period_start(day, group_by)] += 1
+            day += step
+    else:
+        step = interval * (12 if frequency == "yearly" else 1)
+        index = first_due.year * 12 + first_due.month - 1
+        day = first_due
+        while day <= end:
+            counts[period_start(day, group_by)] += 1
+            index += step
+            day = month_day(index, due_day)
+    return tuple(counts.items())
+
+
+# Distinct schedules in the window; each is expanded once in Python. The
+# window usually holds most bills, where a table scan beats the date index.
+_SCHEDULES_SQL = """
+    SELECT DISTINCT frequency, interval, due_day, next_due_date
+    FROM bills NOT INDEXED
+    WHERE next_due_date BETWEEN :start AND :end
+"""
+
+# Maps each schedule to the id of its per-period occurrence pattern. Column
+# types match `bills` so the join below can use the primary key.
+_CREATE_PATTERNS_SQL = """
+    CREATE TEMP TABLE forecast_patterns (
+        frequency VARCHAR,
+        interval INTEGER,
+        due_day INTEGER,
+        next_due_date DATE,
+        pattern INTEGER,
+        PRIMARY KEY (frequency, interval, due_day, next_due_date)
+    )
+"""
+
+_TOTALS_SQL = """
+    SELECT p.pattern, {recipient}, b.currency, COUNT(*), SUM(b.amount)
+    FROM bills AS b NOT INDEXED
+    JOIN temp.forecast_patterns AS p
+        USING (frequency, interval, due_day, next_due_date)
+    WHERE b.next_due_date BETWEEN :start AND :end
+    GROUP BY p.pattern, b.currency{group_recipient}
+"""
+
+
+def _periods(start: datetime.date, end: datetime.date, group_by: str):
+    periods = []
+    period = period_start(start, group_by)
+    while period <= end:
+        periods.append(period)
+        period = (
+            period + datetime.timedelta(days=7)
+            if group_by == "week"
+            else month_day(period.year * 12 + period.month, 1)
+        )
+    return periods
+
+
+def _schedule_patterns(db: Session, params: dict, periods, end, group_by):
+    """Expand each distinct schedule and store its pattern id in a temp table.
+
+    Returns the patterns as tuples of (period index, occurrences), indexed
+    by pattern id. Schedules landing in the same periods share a pattern.
+    """
+    position = {period: i for i, period in enumerate(periods)}
+    patterns: dict[tuple, int] = {}
+    schedules = []
+    for frequency, interval, due_day, first_due in db.execute(
+        text(_SCHEDULES_SQL), params
+    ):
+        slots = tuple(
+            (position[period], occurrences)
+            for period, occurrences in schedule_periods(
+                frequency,
+                interval,
+                due_day,
+                datetime.date.fromisoformat(first_due),
+                end,
+                group_by,
+            )
+        )
+        schedules.append(
+            {
+                "frequency": frequency,
+                "interval": interval,
+                "due_day": due_day,
+                "next_due_date": first_due,
+                "pattern": patterns.setdefault(slots, len(patterns)),
+            }
+        )
+    db.execute(text("DROP TABLE IF EXISTS temp.forecast_patterns"))
+    db.execute(text(_CREATE_PATTERNS_SQL))
+    if schedules:
+        db.execute(
+            text(
+                "INSERT INTO temp.forecast_patterns VALUES (:frequency, :interval, "
+                ":due_day, :next_due_date, :pattern)"
+            ),
+            schedules,
+        )
+    return list(patterns)
+
+
+def forecast(
+    db: Session,
+    start: datetime.date,
+    end: datetime.date,
+    group_by: str = "month",
+    by_recipient: bool = True,
+):
+    """Total scheduled amounts between `start` and `end` (inclusive).
+
+    Each distinct schedule is expanded once into per-period occurrence
+    counts, and schedules that land in the same periods share a pattern.
+    SQL then sums the bills per (pattern, recipient, currency), so Python
+    only multiplies those sums into per-recipient period totals; its work
+    grows with recipients and patterns rather than with bills.
+
+    Amounts are converted to the base currency with the cached rates as of
+    `start`. Bills in currencies without a rate are left out, like in
+    `converted_total`.
+
+    Expects `next_due_date` to be current (see `refresh_due_dates`). Returns
+    (rows, currencies without a rate): rows are (period, recipient,
+    occurrences, total) tuples sorted by period and recipient; recipient is
+    None when `by_recipient` is False.
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of: {', '.join(GROUP_BY)}")
+    # Plain text queries: dates stay strings, so only distinct schedules get parsed
+    params = {"start": start.isoformat(), "end": end.isoformat()}
+    periods = _periods(start, end, group_by)
+    patterns = _schedule_patterns(db, params, periods, end, group_by)
+    try:
+        rows = db.execute(
+            text(
+                _TOTALS_SQL.format(
+                    recipient="b.recipient" if by_recipient else "NULL",
+                    group_recipient=", b.recipient" if by_recipient else "",
+                )
+            ),
+            params,
+        ).all()
+    finally:
+        db.execute(text("DROP TABLE temp.forecast_patterns"))
+
+    convert = rate_cache.converter(db, start)
+    missing = set()
+    counts: dict[str | None, list[int]] = defaultdict(lambda: [0] * len(periods))
+    totals: dict[str | None, list[float]] = defaultdict(lambda: [0.0] * len(periods))
+    for pattern, who, currency, bills, amount in rows:
+        if (amount := convert(amount, currency)) is None:
+            missing.add(currency)
+            continue
+        who_counts, who_totals = counts[who], totals[who]
+        for i, occurrences in patterns[pattern]:
+            who_counts[i] += bills * occurrences
+            who_totals[i] += amount * occurrences
+
+    rows = sorted(
+        (periods[i], who, who_counts[i], totals[who][i])
+        for who, who_counts in counts.items()
+        for i, bills in enumerate(who_counts)
+        if bills
+    )
+    return rows, sorted(missing)
@@ -0,0 +1,194 @@
+"""Currencies and exchange rates, loaded from a local file.
+
+Rates are stored in `fx_rates` as the value of one unit of `currency` in the
+base currency, keyed by (currency, date). The rate used for a report is the
+latest one on or before the report date. Bills already in the base currency
+need no rate.
+"""
+
+import csv
+import datetime
+import re
+import time
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, aliased
+
+from .models import Bill, Config, FxRate
+
+DEFAULT_BASE = "USD"
+DEFAULT_TTL = 300  # seconds
+
+SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥", "INR": "₹"}
+
+_CODE_RE = re.compile(r"^[A-Z]{3}$")
+
+
+def parse_currency(value: str) -> str:
+    """Normalize an ISO 4217 code such as "eur" to "EUR"."""
+    code = value.strip().upper()
+    if not _CODE_RE.match(code):
+        raise ValueError(f"Invalid currency code '{value}'. Use e.g. USD, EUR, GBP")
+    return code
+
+
+def format_amount(amount: float, currency: str) -> str:
+    if symbol := SYMBOLS.get(currency):
+        return f"{symbol}{amount:.2f}"
+    return f"{amount:.2f} {currency}"
+
+
+def base_currency(db: Session) -> str:
+    setting = db.query(Config).filter(Config.key == "base_currency").first()
+    return setting.value if setting else DEFAULT_BASE
+
+
+def read_rate_file(path: str) -> list[dict]:
+    """Parse a CSV of rates with columns currency, date (YYYY-MM-DD) and rate."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if missing := {"currency", "date", "rate"} - set(reader.fieldnames or []):
+            raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+        rows = []
+        for i, row in enumerate(reader, 1):
+            try:
+                rate = float(row["rate"])
+                if rate <= 0:
+                    raise ValueError("rate must be positive")
+                rows.append(
+                    {
+                        "currency": parse_currency(row["currency"]),
+                        "date": datetime.date.fromisoformat(row["date"].strip()),
+                        "rate": rate,
+                    }
+                )
+            except ValueError as e:
+                raise ValueError(f"Row {i}: {e}") from e
+    return rows
+
+
+def store_rates(db: Session, rows: list[dict], base: str) -> int:
+    """Insert or update rates quoted in `base`. The caller commits.
+
+    Switching to a different base currency discards the old rates, since
+    they were quoted against the previous base.
+    """
+    setting = db.query(Config).filter(Config.key == "base_currency").first()
+    if setting is None:
+        db.add(Config(key="base_currency", value=base))
+    elif setting.value != base:
+        db.query(FxRate).delete()
+        setting.value = base
+    if rows:
+        statement = insert(FxRate)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[FxRate.currency, FxRate.date],
+                set_={"rate": statement.excluded.rate},
+            ),
+            rows,
+        )
+    rate_cache.invalidate()
+    return len(rows)
+
+
+def _latest_date(currency, as_of: datetime.date):
+    """Correlated MAX(date) lookup, answered from the (currency, date) index."""
+    earlier = aliased(FxRate)
+    return (
+        select(func.max(earlier.date))
+        .where(earlier.currency == currency, earlier.date <= as_of)
+        .scalar_subquery()
+    )
+
+
+def load_rates(db: Session, as_of: datetime.date) -> dict[str, float]:
+    """Latest rate on or before `as_of` for every currency."""
+    return dict(
+        db.execute(
+            select(FxRate.currency, FxRate.rate).where(
+                FxRate.date == _latest_date(FxRate.currency, as_of)
+            )
+        ).all()
+    )
+
+
+def converted_total(db: Session, *criteria, as_of: datetime.date | None = None):
+    """Sum of bill amounts matching `criteria`, converted to the base currency.
+
+    One query: bills are summed per currency, then joined to each currency's
+    latest rate. Returns (base, total, currencies without a rate); amounts
+    in currencies without a rate are left out of the total.
+    """
+    base = base_currency(db)
+    as_of = as_of or datetime.date.today()
+    per_currency = (
+        select(Bill.currency, func.sum(Bill.amount).label("amount"))
+        .where(*criteria)
+        .group_by(Bill.currency)
+        .subquery()
+    )
+    is_base = per_currency.c.currency == base
+    total, missing = db.execute(
+        select(
+            func.sum(
+                case(
+                    (is_base, per_currency.c.amount),
+                    else_=per_currency.c.amount * FxRate.rate,
+                )
+            ),
+            func.group_concat(
+                case((and_(~is_base, FxRate.rate.is_(None)), per_currency.c.currency))
+            ),
+        ).select_from(
+            per_currency.outerjoin(
+                FxRate,
+                and_(
+                    FxRate.currency == per_currency.c.currency,
+                    FxRate.date == _latest_date(per_currency.c.currency, as_of),
+                ),
+            )
+        )
+    ).one()
+    return base, total or 0.0, sorted(missing.split(",")) if missing else []
+
+
+class RateCache:
+    """In-memory rates per report date, reloaded after `ttl` seconds.
+
+    `store_rates` invalidates the shared `rate_cache`, so a rate import is
+    seen immediately by the process that made it.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries: dict[datetime.date, tuple[float, str, dict]] = {}
+
+    def get(self, db: Session, as_of: datetime.date | None = None):
+        """Return (base currency, {currency: rate}) as of a date."""
+        as_of = as_of or datetime.date.today()
+        entry = self._entries.get(as_of)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            entry = (time.monotonic(), base_currency(db), load_rates(db, as_of))
+            self._entries[as_of] = entry
+        return entry[1], entry[2]
+
+    def converter(self, db: Session, as_of: datetime.date | None = None):
+        """Function of (amount, currency) returning the amount in the base
+        currency, or None when there is no rate."""
+        base, rates = self.get(db, as_of)
+
+        def convert(amount: float, currency: str) -> float | None:
+            if currency == base:
+                return amount
+            rate = rates.get(currency)
+            return None if rate is None else amount * rate
+
+        return convert
+
+    def invalidate(self):
+        self._entries.clear()
+
+
+rate_cache = RateCache()
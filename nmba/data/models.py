@@ -1,4 +1,14 @@
-from sqlalchemy import Boolean, Column, Float, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -6,12 +16,22 @@ Base = declarative_base()
 
 class Bill(Base):
     __tablename__ = "bills"
+    # AUTOINCREMENT: ids of deleted bills are never handed out again, so the
+    # audit log (keyed by bill id) cannot mix two bills' histories
+    __table_args__ = {"sqlite_autoincrement": True}
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     recipient = Column(String, nullable=False)
     due_day = Column(Integer, nullable=False)
     amount = Column(Float, nullable=False)
     paid = Column(Boolean, default=False)
+    frequency = Column(
+        String, nullable=False, default="monthly", server_default="monthly"
+    )
+    interval = Column(Integer, nullable=False, default=1, server_default="1")
+    anchor_date = Column(Date, nullable=True)
+    next_due_date = Column(Date, nullable=True, index=True)
+    currency = Column(String, nullable=False, default="USD", server_default="USD")
 
 
 class Config(Base):
@@ -19,3 +39,35 @@ class Config(Base):
     id = Column(Integer, primary_key=True, index=True)
     key = Column(String, nullable=False)
     value = Column(String, nullable=False)
+
+
+class BillEvent(Base):
+    """Append-only record of a change to a bill.
+
+    `changes` is JSON: the full bill state for "created", "deleted" and
+    "snapshot" events, and {field: [old, new]} for "updated" events.
+    """
+
+    __tablename__ = "bill_events"
+    __table_args__ = (
+        Index("ix_bill_events_bill_id_created_at", "bill_id", "created_at"),
+    )
+    id = Column(Integer, primary_key=True)
+    bill_id = Column(Integer, nullable=False)
+    event = Column(String, nullable=False)
+    changes = Column(Text, nullable=False)
+    actor = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, index=True)
+
+
+class FxRate(Base):
+    """Value of one unit of `currency` in the base currency on `date`."""
+
+    __tablename__ = "fx_rates"
+    __table_args__ = (
+        Index("ix_fx_rates_currency_date", "currency", "date", unique=True),
+    )
+    id = Column(Integer, primary_key=True)
+    currency = Column(String, nullable=False)
+    date = Column(Date, nullable=False)
+    rate = Column(Float, nullable=False)
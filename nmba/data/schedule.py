@@ -0,0 +1,179 @@
+"""Recurrence rules for bills and precomputed next due dates.
+
+A bill repeats every `interval` units of `frequency` (daily, weekly, monthly
+or yearly), counted from `anchor_date`. Monthly and yearly bills fall on
+`due_day`, clamped to the last day of shorter months. A plain monthly bill
+(interval 1) needs no anchor.
+"""
+
+import calendar
+import datetime
+import functools
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from .models import Bill
+
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly")
+
+# Friendly names accepted on the command line and in CSV imports
+FREQUENCY_ALIASES = {
+    "day": ("daily", 1),
+    "week": ("weekly", 1),
+    "biweekly": ("weekly", 2),
+    "month": ("monthly", 1),
+    "quarterly": ("monthly", 3),
+    "quarter": ("monthly", 3),
+    "semiannual": ("monthly", 6),
+    "annual": ("yearly", 1),
+    "annually": ("yearly", 1),
+    "year": ("yearly", 1),
+}
+
+
+def parse_frequency(value: str, interval: int = 1) -> tuple[str, int]:
+    """Normalize a frequency name (e.g. "quarterly") to (frequency, interval)."""
+    key = value.strip().lower()
+    if key in FREQUENCIES:
+        frequency, multiplier = key, 1
+    elif key in FREQUENCY_ALIASES:
+        frequency, multiplier = FREQUENCY_ALIASES[key]
+    else:
+        raise ValueError(
+            f"Unknown frequency '{value}'. Use one of: "
+            + ", ".join(FREQUENCIES + tuple(FREQUENCY_ALIASES))
+        )
+    if interval < 1:
+        raise ValueError("Interval must be at least 1")
+    return frequency, interval * multiplier
+
+
+def needs_anchor(frequency: str, interval: int) -> bool:
+    """Whether the schedule needs an anchor date to know which cycles are due."""
+    return not (frequency == "monthly" and interval == 1)
+
+
+def month_day(month_index: int, day: int) -> datetime.date:
+    """Day `day` of the month numbered `month_index` (year * 12 + month - 1),
+    clamped to the end of that month."""
+    year, month = divmod(month_index, 12)
+    month += 1
+    return datetime.date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def add_months(day: datetime.date, months: int) -> datetime.date:
+    return month_day(day.year * 12 + day.month - 1 + months, day.day)
+
+
+@functools.lru_cache(maxsize=4096)
+def next_occurrence(
+    frequency: str,
+    interval: int,
+    due_day: int,
+    anchor_date: datetime.date | None,
+    on_or_after: datetime.date,
+) -> datetime.date:
+    """Return the first due date of the schedule on or after `on_or_after`.
+
+    Computed in closed form, so the cost does not depend on how far the
+    anchor lies in the past. Schedules without an anchor start at
+    `on_or_after`.
+    """
+    anchor = anchor_date or on_or_after
+    if frequency in ("daily", "weekly"):
+        step = interval * (7 if frequency == "weekly" else 1)
+        delta = (on_or_after - anchor).days
+        if delta <= 0:
+            return anchor
+        return anchor + datetime.timedelta(days=-(-delta // step) * step)
+
+    step = interval * (12 if frequency == "yearly" else 1)
+    anchor_index = anchor.year * 12 + anchor.month - 1
+    elapsed = max(on_or_after.year * 12 + on_or_after.month - 1 - anchor_index, 0)
+    index = anchor_index + -(-elapsed // step) * step
+    candidate = month_day(index, due_day)
+    while candidate < on_or_after or candidate < anchor:
+        index += step
+        candidate = month_day(index, due_day)
+    return candidate
+
+
+def compute_next_due_dates(rows, on_or_after: datetime.date) -> list[tuple]:
+    """Evaluate many schedules in one pass.
+
+    `rows` yields (id, frequency, interval, due_day, anchor_date) tuples; the
+    result is a list of (next_due_date, id) tuples ready for an executemany
+    UPDATE. Bills sharing a schedule are computed once thanks to the cache on
+    `next_occurrence`.
+    """
+    return [
+        (
+            next_occurrence(frequency, interval, due_day, anchor_date, on_or_after),
+            bill_id,
+        )
+        for bill_id, frequency, interval, due_day, anchor_date in rows
+    ]
+
+
+def schedule_bill(bill: Bill, on_or_after: datetime.date | None = None):
+    """Set `bill.next_due_date` from its schedule fields."""
+    bill.next_due_date = next_occurrence(
+        bill.frequency or "monthly",
+        bill.interval or 1,
+        bill.due_day,
+        bill.anchor_date,
+        on_or_after or datetime.date.today(),
+    )
+
+
+def _stale(today: datetime.date):
+    return or_(Bill.next_due_date.is_(None), Bill.next_due_date < today)
+
+
+def has_stale_due_dates(db: Session, today: datetime.date | None = None) -> bool:
+    """Read-only check for whether `refresh_due_dates` has anything to do."""
+    today = today or datetime.date.today()
+    return db.execute(select(Bill.id).where(_stale(today)).limit(1)).first() is not None
+
+
+def refresh_due_dates(db: Session, today: datetime.date | None = None) -> int:
+    """Roll stale or missing `next_due_date` values forward to today or later.
+
+    Only bills whose due date has passed (or was never computed) are read and
+    updated, so this is cheap to run before every report. The caller commits.
+    """
+    today = today or datetime.date.today()
+    rows = db.execute(
+        select(
+            Bill.id, Bill.frequency, Bill.interval, Bill.due_day, Bill.anchor_date
+        ).where(_stale(today))
+    ).all()
+    if rows:
+        # Plain executemany: the ORM bulk-update path costs more than the
+        # UPDATEs themselves for large tables.
+        db.connection().exec_driver_sql(
+            "UPDATE bills SET next_due_date = ? WHERE id = ?",
+            [
+                (due.isoformat(), bill_id)
+                for due, bill_id in compute_next_due_dates(rows, today)
+            ],
+        )
+    return len(rows)
+
+
+_UNITS = {"daily": "day", "weekly": "week", "monthly": "month", "yearly": "year"}
+
+
+def describe_schedule(
+    frequency: str, interval: int, due_day: int, anchor_date: datetime.date | None
+) -> str:
+    """Human readable summary, e.g. "every 3 months on day 15"."""
+    text = frequency if interval == 1 else f"every {interval} {_UNITS[frequency]}s"
+    if frequency == "monthly":
+        text += f" on day {due_day}"
+    elif frequency == "yearly" and anchor_date:
+        text += f" on {anchor_date:%b} {due_day}"
+    elif frequency == "weekly" and anchor_date:
+        text += f" on {anchor_date:%A}s"
+    return text
@@ -9,6 +9,10 @@ class BillBase(BaseModel):
     due_day: int
     amount: float
     paid: bool = False
+    frequency: str = "monthly"
+    interval: int = 1
+    anchor_date: date | None = None
+    currency: str = "USD"
 
 
 class BillCreate(BillBase):
@@ -17,4 +21,5 @@ class BillCreate(BillBase):
 
 class Bill(BillBase):
     id: int
+    next_due_date: date | None = None
     model_config = {"from_attributes": True}
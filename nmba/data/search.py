@@ -0,0 +1,158 @@
+"""Full-text search over bills backed by SQLite FTS5."""
+
+import math
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+# Two external-content FTS5 indexes over bills(name, recipient): a word index
+# with prefix tables for ranked/prefix matching, and a trigram index used for
+# substring and fuzzy matching. Triggers keep both in sync with the bills table.
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS bills_fts USING fts5(
+        name, recipient,
+        content='bills', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS bills_trigram USING fts5(
+        name, recipient,
+        content='bills', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bills_search_ai AFTER INSERT ON bills BEGIN
+        INSERT INTO bills_fts(rowid, name, recipient)
+            VALUES (new.id, new.name, new.recipient);
+        INSERT INTO bills_trigram(rowid, name, recipient)
+            VALUES (new.id, new.name, new.recipient);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bills_search_ad AFTER DELETE ON bills BEGIN
+        INSERT INTO bills_fts(bills_fts, rowid, name, recipient)
+            VALUES ('delete', old.id, old.name, old.recipient);
+        INSERT INTO bills_trigram(bills_trigram, rowid, name, recipient)
+            VALUES ('delete', old.id, old.name, old.recipient);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bills_search_au
+    AFTER UPDATE OF name, recipient ON bills BEGIN
+        INSERT INTO bills_fts(bills_fts, rowid, name, recipient)
+            VALUES ('delete', old.id, old.name, old.recipient);
+        INSERT INTO bills_trigram(bills_trigram, rowid, name, recipient)
+            VALUES ('delete', old.id, old.name, old.recipient);
+        INSERT INTO bills_fts(rowid, name, recipient)
+            VALUES (new.id, new.name, new.recipient);
+        INSERT INTO bills_trigram(rowid, name, recipient)
+            VALUES (new.id, new.name, new.recipient);
+    END
+    """,
+]
+
+REBUILD_SEARCH_INDEX = [
+    "INSERT INTO bills_fts(bills_fts) VALUES ('rebuild')",
+    "INSERT INTO bills_trigram(bills_trigram) VALUES ('rebuild')",
+]
+
+_RESULT_COLUMNS = "b.id, b.name, b.recipient, b.due_day, b.amount, b.currency, b.paid"
+
+
+def create_search_index(conn):
+    """Create the FTS5 tables and triggers (idempotent) and rebuild them."""
+    for statement in SEARCH_INDEX_DDL + REBUILD_SEARCH_INDEX:
+        conn.exec_driver_sql(statement)
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def prefix_query(query: str) -> str:
+    """Build an FTS5 query matching every word of `query` as a prefix."""
+    return " ".join(f"{_quote(term)}*" for term in query.split())
+
+
+# Fuzzy matches must share at least this fraction of the query's trigrams,
+# so one common trigram ("ter") does not match unrelated bills
+MIN_TRIGRAM_SHARE = 1 / 3
+
+
+def trigrams(query: str) -> list[str]:
+    """Distinct trigrams of the words in `query`, in order."""
+    return list(
+        dict.fromkeys(
+            word[i : i + 3]
+            for word in query.lower().split()
+            for i in range(len(word) - 2)
+        )
+    )
+
+
+def _fuzzy_search(db: Session, query: str, limit: int):
+    """Bills sharing at least MIN_TRIGRAM_SHARE of the query's trigrams.
+
+    Each trigram is matched on its own and the hits are counted per bill;
+    bills sharing more trigrams rank higher, which tolerates typos and
+    partial words.
+    """
+    grams = trigrams(query)
+    if not grams:
+        return []
+    hits = " UNION ALL ".join(
+        f"SELECT rowid FROM bills_trigram WHERE bills_trigram MATCH :g{i}"
+        for i in range(len(grams))
+    )
+    sql = text(
+        f"SELECT {_RESULT_COLUMNS} FROM ("
+        f"SELECT rowid, COUNT(*) AS hits FROM ({hits}) "
+        "GROUP BY rowid HAVING hits >= :min_hits"
+        ") AS matched JOIN bills b ON b.id = matched.rowid "
+        "ORDER BY matched.hits DESC, b.id LIMIT :limit"
+    )
+    params = {f"g{i}": _quote(gram) for i, gram in enumerate(grams)}
+    min_hits = max(1, math.ceil(len(grams) * MIN_TRIGRAM_SHARE))
+    return db.execute(sql, {**params, "min_hits": min_hits, "limit": limit}).all()
+
+
+def search_bills(db: Session, query: str, fuzzy: bool = False, limit: int = 20):
+    """Return bills matching `query`, best match first.
+
+    Uses prefix matching on the word index, or trigram matching when `fuzzy`
+    is set.
+    """
+    if fuzzy:
+        return _fuzzy_search(db, query, limit)
+    match = prefix_query(query)
+    if not match:
+        return []
+    sql = text(
+        f"SELECT {_RESULT_COLUMNS} FROM bills_fts "
+        "JOIN bills b ON b.id = bills_fts.rowid "
+        "WHERE bills_fts MATCH :match ORDER BY rank LIMIT :limit"
+    )
+    return db.execute(sql, {"match": match, "limit": limit}).all()
+
+
+def scan_bills(db: Session, query: str, limit: int = 20):
+    """Unindexed LIKE scan, used when the search index has not been created."""
+    sql = text(
+        f"SELECT {_RESULT_COLUMNS} FROM bills b "
+        "WHERE b.name LIKE :pattern OR b.recipient LIKE :pattern "
+        "ORDER BY b.id LIMIT :limit"
+    )
+    return db.execute(sql, {"pattern": f"%{query}%", "limit": limit}).all()
+
+
+def has_search_index(db: Session) -> bool:
+    try:
+        db.execute(text("SELECT 1 FROM bills_fts LIMIT 0"))
+    except OperationalError:
+        db.rollback()
+        return False
+    return True
@@ -0,0 +1,238 @@
+"""Notification messages with per-target templates and size limits.
+
+Each notify target may have its own line and title templates (str.format
+syntax), a maximum body length and an overflow mode:
+
+- "split" sends as many messages as needed, breaking between bills.
+- "digest" sends one message with the bills that fit, then a summary of the
+  rest and an optional link.
+
+Templates are parsed once and cached. Bills are streamed into the messages
+one at a time, so the full body never has to be built in memory.
+"""
+
+import datetime
+import functools
+import string
+
+import apprise
+
+from nmba.data.fx import DEFAULT_BASE, format_amount
+from nmba.data.schedule import describe_schedule
+
+MODES = ("split", "digest")
+# {money} is the amount formatted with its currency, e.g. "$12.50" or "€9.00"
+LINE_FIELDS = (
+    "name",
+    "recipient",
+    "due_date",
+    "amount",
+    "currency",
+    "money",
+    "schedule",
+)
+TITLE_FIELDS = ("count", "total", "currency", "money")
+DEFAULT_LINE = "{name} to {recipient} due on {due_date} for {money}"
+DEFAULT_TITLE = "Upcoming Bills Reminder (Total: {money})"
+
+# Values used to check a template when it is compiled
+_SAMPLE = {
+    "name": "Rent",
+    "recipient": "Landlord",
+    "due_date": datetime.date(2000, 1, 1),
+    "amount": 0.0,
+    "currency": DEFAULT_BASE,
+    "money": "$0.00",
+    "schedule": "monthly on day 1",
+    "count": 0,
+    "total": 0.0,
+}
+
+
+@functools.lru_cache(maxsize=128)
+def compile_template(source: str, fields: tuple[str, ...] = LINE_FIELDS):
+    """Parse `source` once into a function of a dict of field values.
+
+    Raises ValueError for unknown fields or format specs that do not apply.
+    """
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(source):
+        if field is not None and field not in fields:
+            raise ValueError(
+                f"Unknown template field '{{{field}}}'. Use: "
+                + ", ".join(f"{{{name}}}" for name in fields)
+            )
+        if conversion:
+            raise ValueError("Template conversions (!r, !s) are not supported")
+        parts.append((literal, field, spec or ""))
+
+    def render(values: dict) -> str:
+        return "".join(
+            literal if field is None else literal + format(values[field], spec)
+            for literal, field, spec in parts
+        )
+
+    render(_SAMPLE)
+    return render
+
+
+def bill_values(row, convert=None) -> dict:
+    """Template values for a row with bill name, recipient, schedule and amount.
+
+    `convert(amount, currency)` gives the amount in the base currency (see
+    `RateCache.converter`), used for digest summaries.
+    """
+    return {
+        "name": row.name,
+        "recipient": row.recipient,
+        "due_date": row.next_due_date,
+        "amount": row.amount,
+        "currency": row.currency,
+        "money": format_amount(row.amount, row.currency),
+        "schedule": describe_schedule(
+            row.frequency, row.interval, row.due_day, row.anchor_date
+        ),
+        "base_amount": convert(row.amount, row.currency) if convert else row.amount,
+    }
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: max(limit - 1, 0)] + "…"
+
+
+def split_messages(lines, limit: int):
+    """Pack lines into bodies of at most `limit` characters, breaking between lines."""
+    chunk, size = [], 0
+    for line in lines:
+        line = _clip(line, limit)
+        if chunk and size + 1 + len(line) > limit:
+            yield "\n".join(chunk)
+            chunk, size = [], 0
+        size += len(line) + (1 if chunk else 0)
+        chunk.append(line)
+    if chunk:
+        yield "\n".join(chunk)
+
+
+def excluded_note(missing) -> str:
+    """Marks a total that leaves out currencies without an exchange rate."""
+    return f" excl. {', '.join(sorted(missing))}" if missing else ""
+
+
+def _digest_footer(
+    hidden: int, amount: float, currency: str, link: str | None, missing=()
+) -> str:
+    footer = (
+        f"...and {hidden} more "
+        f"({format_amount(amount, currency)}{excluded_note(missing)})"
+    )
+    return f"{footer}: {link}" if link else footer
+
+
+def digest_message(
+    bills,
+    render,
+    limit: int,
+    count: int,
+    total: float,
+    link=None,
+    currency: str = DEFAULT_BASE,
+    missing=(),
+):
+    """One body of at most `limit` characters: the first bills that fit, then
+    a summary of the rest, totalled in `currency`.
+
+    Room for the summary is reserved up front from `count`, `total` and the
+    currencies without a rate (`missing`), so bills are consumed one at a
+    time and only the visible lines are kept. Hidden bills without a rate
+    are left out of the summary total, which names their currencies.
+    """
+    room = limit - len(_digest_footer(count, total, currency, link, missing)) - 1
+    shown, size, hidden, rest, excluded = [], 0, 0, 0.0, set()
+    for values in bills:
+        line = render(values)
+        needed = size + len(line) + (1 if shown else 0)
+        if not hidden and needed <= room:
+            shown.append(line)
+            size = needed
+        else:
+            hidden += 1
+            if values["base_amount"] is None:
+                excluded.add(values["currency"])
+            else:
+                rest += values["base_amount"]
+    if hidden:
+        shown.append(_digest_footer(hidden, rest, currency, link, excluded))
+    return _clip("\n".join(shown), limit)
+
+
+def build_messages(
+    bills,
+    options: dict,
+    limit: int,
+    count: int,
+    total: float,
+    currency: str = DEFAULT_BASE,
+    missing=(),
+):
+    """Yield the message bodies for one target from an iterable of bill values."""
+    render = compile_template(options.get("template") or DEFAULT_LINE)
+    if options.get("mode") == "digest":
+        yield digest_message(
+            bills, render, limit, count, total, options.get("link"), currency, missing
+        )
+    else:
+        yield from split_messages(map(render, bills), limit)
+
+
+def send_to_target(
+    url: str,
+    options: dict,
+    bills,
+    count: int,
+    total: float,
+    currency: str = DEFAULT_BASE,
+    missing=(),
+):
+    """Send the bills to one Apprise target. Returns (messages sent, all ok).
+
+    `total` is the converted total of all the bills, in `currency`, leaving
+    out the currencies in `missing` (no exchange rate). The title then says
+    so: {money} reads e.g. "$40.00 excl. EUR", and titles without {money}
+    get the note appended.
+
+    The body limit is the target's own (e.g. 1024 for Pushover), lowered by
+    the target's `max_length` option. Split messages are numbered in the
+    title; each is sent as soon as the next one starts, so only one is held.
+    """
+    plugin = apprise.Apprise.instantiate(url)
+    if plugin is None:
+        raise ValueError(f"Invalid notification target: {url}")
+    limit = plugin.body_maxlen
+    if options.get("max_length"):
+        limit = min(limit, options["max_length"])
+    source = options.get("title") or DEFAULT_TITLE
+    title = compile_template(source, TITLE_FIELDS)(
+        {
+            "count": count,
+            "total": total,
+            "currency": currency,
+            "money": format_amount(total, currency) + excluded_note(missing),
+        }
+    )
+    if missing and "{money" not in source:
+        title += f" ({excluded_note(missing).strip()})"
+
+    sent, ok, held = 0, True, None
+    for body in build_messages(bills, options, limit, count, total, currency, missing):
+        if held is not None:
+            sent += 1
+            ok = plugin.notify(body=held, title=f"{title} ({sent})") and ok
+        held = body
+    if held is not None:
+        sent += 1
+        ok = (
+            plugin.notify(body=held, title=title if sent == 1 else f"{title} ({sent})")
+            and ok
+        )
+    return sent, bool(ok)
@@ -0,0 +1,116 @@
+"""Table output that stays fast for very large result sets.
+
+When stdout is not a terminal (pipes, cron logs) rows are streamed as
+tab-separated text without building a Rich table. On a terminal, tables
+that fit on screen render as usual; larger ones are shown one screenful at
+a time, and only the rows of the visible page are fetched and laid out.
+"""
+
+import sys
+
+import click
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import func, select
+
+# Lines taken by the title, header, borders and the pager prompt
+_CHROME_LINES = 8
+
+
+class QueryRows:
+    """Sequence-like view over a SELECT: len() counts, slicing pages with
+    LIMIT/OFFSET and iteration streams in batches, formatting each row with
+    `format_row`."""
+
+    def __init__(self, db, statement, format_row, batch_size: int = 1000):
+        self.db = db
+        self.statement = statement
+        self.format_row = format_row
+        self.batch_size = batch_size
+        self._count = None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.db.execute(
+                select(func.count()).select_from(self.statement.subquery())
+            ).scalar_one()
+        return self._count
+
+    def __getitem__(self, window: slice):
+        start = window.start or 0
+        stop = len(self) if window.stop is None else window.stop
+        rows = self.db.execute(self.statement.offset(start).limit(max(stop - start, 0)))
+        return [self.format_row(row) for row in rows]
+
+    def __iter__(self):
+        result = self.db.execute(
+            self.statement.execution_options(yield_per=self.batch_size)
+        )
+        for row in result:
+            yield self.format_row(row)
+
+
+def _build_table(title, columns, rows, caption=None) -> Table:
+    table = Table(title=title, caption=caption)
+    for header, options in columns:
+        table.add_column(header, **options)
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+
+def stream_rows(console: Console, title, columns, rows):
+    """Write rows as tab-separated lines, without any layout work."""
+    write = console.file.write
+    if title:
+        write(f"{title}\n")
+    write("\t".join(header for header, _ in columns) + "\n")
+    for row in rows:
+        write("\t".join(row) + "\n")
+    console.file.flush()
+
+
+def page_rows(console: Console, title, columns, rows, page_size: int):
+    """Interactive pager: render one page of rows at a time."""
+    total = len(rows)
+    pages = (total + page_size - 1) // page_size
+    page = 0
+    while True:
+        start = page * page_size
+        stop = min(start + page_size, total)
+        console.clear()
+        console.print(
+            _build_table(
+                title,
+                columns,
+                rows[start:stop],
+                caption=f"Rows {start + 1}-{stop} of {total:,} (page {page + 1}/{pages})",
+            )
+        )
+        console.print("[dim][n]ext  [p]revious  [g]first  [G]last  [q]uit[/dim]")
+        key = click.getchar()
+        if key in ("q", "Q", "\x1b", "\x03"):
+            break
+        if key in ("n", " ", "j", "\r", "\n") and page < pages - 1:
+            page += 1
+        elif key in ("p", "k", "b") and page > 0:
+            page -= 1
+        elif key == "g":
+            page = 0
+        elif key == "G":
+            page = pages - 1
+
+
+def render_table(console: Console, title, columns, rows, paginate: bool = True):
+    """Print `rows` (a list or QueryRows of string tuples) as a table.
+
+    `columns` is a list of (header, Rich add_column options) pairs.
+    """
+    if not console.is_terminal:
+        stream_rows(console, title, columns, rows)
+        return
+    page_size = max(console.height - _CHROME_LINES, 5)
+    if paginate and sys.stdin.isatty() and len(rows) > page_size:
+        page_rows(console, title, columns, rows, page_size)
+        return
+    console.print(_build_table(title, columns, rows))
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from nmba.data.fx import rate_cache
+from nmba.data.models import Base
+from nmba.data.search import create_search_index
+
+
+@pytest.fixture
+def engine():
+    """Fresh in-memory database with all tables.
+
+    StaticPool shares the one connection, so every session (including
+    ones made by code under test) sees the same data.
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    rate_cache.invalidate()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def search_db(engine, db):
+    """Like `db`, with the FTS5 search tables and triggers."""
+    with engine.begin() as conn:
+        create_search_index(conn)
+    return db
@@ -0,0 +1,49 @@
+import os
+import sqlite3
+
+import pytest
+
+from nmba.data import backup
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "nmba.db")
+    snapshots = str(tmp_path / "snapshots")
+    monkeypatch.setattr(backup, "DB_PATH", path)
+    monkeypatch.setattr(backup, "SNAPSHOT_DIR", snapshots)
+    monkeypatch.setattr(
+        backup, "_FINGERPRINT_FILE", os.path.join(snapshots, ".fingerprint")
+    )
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE bills (name TEXT)")
+        conn.execute("INSERT INTO bills VALUES ('Rent')")
+    return path
+
+
+def test_snapshot_skipped_until_database_changes(db_path):
+    assert backup.take_snapshot("first")
+    assert backup.take_snapshot("second") is None
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO bills VALUES ('Gym')")
+    assert backup.take_snapshot("third")
+    assert [s["reason"] for s in backup.list_snapshots()] == ["third", "first"]
+
+
+def test_restore_brings_back_deleted_rows(db_path):
+    snapshot = backup.take_snapshot("before-delete")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM bills")
+
+    backup.restore_snapshot(snapshot)
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT name FROM bills").fetchall() == [("Rent",)]
+
+
+def test_retention_keeps_newest_snapshots(db_path):
+    first = backup.take_snapshot("first")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO bills VALUES ('Gym')")
+    second = backup.take_snapshot("second", keep=1)
+    assert not os.path.exists(first)
+    assert [s["path"] for s in backup.list_snapshots()] == [second]
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from nmba import completion
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    cache_dir = tmp_path / ".never_miss_a_bill_again"
+    monkeypatch.setattr(completion, "CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(completion, "CACHE_PATH", str(cache_dir / "completions.json"))
+    return tmp_path
+
+
+def test_update_cache_counts_and_drops_unused_values(cache_home):
+    assert not completion.update_cache(added=[("Rent", "Landlord")])
+    completion.write_cache({"Rent": 1}, {"Landlord": 1})
+    assert completion.update_cache(
+        added=[("Gym", "Planet"), ("gym class", "Planet")],
+        removed=[("Rent", "Landlord")],
+    )
+    assert completion.load_cache() == {
+        "names": {"Gym": 1, "gym class": 1},
+        "recipients": {"Planet": 2},
+    }
+    assert completion.matches("names", "GY") == ["Gym", "gym class"]
+    assert completion.matches("all", "") == ["Planet", "Gym", "gym class"]
+
+
+def test_fast_path_answers_without_importing_the_cli(cache_home):
+    completion.write_cache({"Gym": 1}, {"Planet Fitness": 2, "Geico": 1})
+    script = (
+        "import sys\n"
+        "from nmba import completion\n"
+        "print(completion.fast_complete('bash'))\n"
+        "print(sorted({'sqlalchemy', 'apprise', 'typer'} & set(sys.modules)))\n"
+    )
+    env = dict(
+        os.environ,
+        HOME=str(cache_home),
+        COMP_WORDS="nmba edit-bill 3 --recipient G",
+        COMP_CWORD="4",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    assert result.stdout.splitlines() == ["Geico", "[]"]
+
+
+@pytest.mark.parametrize(
+    "words, kind",
+    [
+        (["search"], "all"),
+        (["search", "--limit"], None),
+        (["search", "gym"], None),
+        (["add-bill", "--name"], "names"),
+        (["edit-bill", "1", "--recipient"], "recipients"),
+        (["mark-paid"], None),
+    ],
+)
+def test_value_kind(words, kind):
+    assert completion._value_kind(words, "") == kind
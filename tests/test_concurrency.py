@@ -0,0 +1,167 @@
+"""Stress test: several nmba processes writing to one database at once."""
+
+import csv
+import datetime
+import math
+import multiprocessing
+import os
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+
+from nmba.data.models import Base
+from nmba.data.search import create_search_index
+
+PROCESSES = 4
+ROUNDS = 8
+IMPORT_ROWS = 10
+P99_LIMIT = 10.0  # seconds; generous for slow CI machines
+
+
+def worker(home: str, worker_id: int, results):
+    os.environ["HOME"] = home
+    from typer.testing import CliRunner
+
+    from nmba.cli import app
+
+    runner = CliRunner()
+    csv_path = os.path.join(home, f"import-{worker_id}.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "recipient", "due_day", "amount"])
+        for i in range(IMPORT_ROWS):
+            writer.writerow([f"w{worker_id}-{i}", "Acme", 1 + i, 10])
+
+    timings, failures = [], []
+    for round_ in range(ROUNDS):
+        bill_id = 1 + worker_id * ROUNDS + round_
+        for args in (
+            ["mark-paid", str(bill_id)],
+            ["notify", "-l", "40"],
+            ["import-csv", csv_path] if round_ % 4 == 0 else ["list-bills"],
+        ):
+            start = time.perf_counter()
+            result = runner.invoke(app, args)
+            timings.append(time.perf_counter() - start)
+            if result.exit_code:
+                failures.append((args, result.output))
+    results.put((timings, failures))
+
+
+def test_concurrent_writers_lose_no_updates(tmp_path):
+    home = str(tmp_path)
+    db_dir = os.path.join(home, ".never_miss_a_bill_again")
+    os.makedirs(db_dir)
+    engine = create_engine(f"sqlite:///{os.path.join(db_dir, 'nmba.db')}")
+    Base.metadata.create_all(bind=engine)
+    seeded = PROCESSES * ROUNDS
+    stale = datetime.date.today() - datetime.timedelta(days=40)
+    with engine.begin() as conn:
+        create_search_index(conn)
+        conn.execute(
+            text(
+                "INSERT INTO bills (name, recipient, due_day, amount, paid, "
+                "frequency, interval, next_due_date) "
+                "VALUES (:name, 'Acme', 1, 5, 0, 'monthly', 1, :stale)"
+            ),
+            [{"name": f"seed {i}", "stale": stale.isoformat()} for i in range(seeded)],
+        )
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(home, i, results))
+        for i in range(PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get(timeout=600) for _ in processes]
+    for process in processes:
+        process.join()
+
+    timings = sorted(t for worker_timings, _ in outcomes for t in worker_timings)
+    failures = [f for _, worker_failures in outcomes for f in worker_failures]
+    assert failures == []
+
+    imports = PROCESSES * len(range(0, ROUNDS, 4)) * IMPORT_ROWS
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM bills")).scalar() == (
+            seeded + imports
+        )
+        assert (
+            conn.execute(
+                text(f"SELECT COUNT(*) FROM bills WHERE paid AND id <= {seeded}")
+            ).scalar()
+            == seeded
+        )
+        events = dict(
+            conn.execute(
+                text("SELECT event, COUNT(*) FROM bill_events GROUP BY event")
+            ).all()
+        )
+        assert events == {"created": imports, "updated": seeded}
+        assert (
+            conn.execute(
+                text("SELECT COUNT(*) FROM bills WHERE next_due_date < :today"),
+                {"today": datetime.date.today().isoformat()},
+            ).scalar()
+            == 0
+        )
+
+    p99 = timings[math.ceil(len(timings) * 0.99) - 1]  # nearest rank
+    assert p99 < P99_LIMIT
+
+
+@pytest.fixture
+def locked_db(tmp_path):
+    """Session factory with a short busy timeout, and another connection
+    holding the write lock on the same database."""
+    path = str(tmp_path / "nmba.db")
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("CREATE TABLE counter (n INTEGER)")
+    holder.execute("BEGIN IMMEDIATE")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 0.05})
+    yield sessionmaker(bind=engine), holder
+    holder.close()
+    engine.dispose()
+
+
+def test_run_write_retries_until_the_lock_is_free(locked_db, monkeypatch):
+    # Not imported at module level: spawned workers import this module, and
+    # nmba.data.database fixes the database path from HOME on import
+    from nmba.data import database
+
+    factory, holder = locked_db
+    pauses = []
+
+    def sleep(seconds):
+        pauses.append(seconds)
+        holder.rollback()
+
+    def work(db):
+        db.execute(text("INSERT INTO counter VALUES (1)"))
+        return "done"
+
+    monkeypatch.setattr(database.time, "sleep", sleep)
+    assert database.run_write(work, factory) == "done"
+    assert len(pauses) == 1
+    assert 0 <= pauses[0] <= database.RETRY_BACKOFF
+    with factory() as db:
+        assert db.execute(text("SELECT COUNT(*) FROM counter")).scalar() == 1
+
+
+def test_run_write_gives_up_after_retries(locked_db, monkeypatch):
+    from nmba.data import database
+
+    factory, _ = locked_db
+    pauses = []
+    monkeypatch.setattr(database.time, "sleep", pauses.append)
+    with pytest.raises(OperationalError, match="locked"):
+        database.run_write(lambda db: None, factory, retries=2)
+    assert len(pauses) == 2
+    assert pauses[1] <= database.RETRY_BACKOFF * 2
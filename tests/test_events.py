@@ -0,0 +1,111 @@
+import datetime
+import json
+
+from nmba.data.events import (
+    bill_state,
+    compact_history,
+    get_history,
+    record_all_deleted,
+    record_all_paid,
+    record_created,
+    record_updated,
+)
+from nmba.data.models import Bill, BillEvent
+
+
+def test_bulk_paid_only_logs_changed_bills(db):
+    db.add_all(
+        [
+            Bill(name="Rent", recipient="Landlord", due_day=1, amount=1500),
+            Bill(name="Gym", recipient="Planet", due_day=5, amount=10, paid=True),
+        ]
+    )
+    db.commit()
+    record_all_paid(db, True)
+    db.commit()
+    [event] = get_history(db)
+    assert event.event == "updated"
+    assert json.loads(event.changes) == {"paid": [False, True]}
+
+
+def test_bulk_delete_logs_same_state_as_single_bill(db):
+    bill = Bill(name="Rent", recipient="Landlord", due_day=1, amount=1500)
+    db.add(bill)
+    record_created(db, bill)
+    db.commit()
+    record_all_deleted(db)
+    db.commit()
+    deleted, created = get_history(db, bill.id)
+    assert deleted.event == "deleted"
+    assert json.loads(deleted.changes) == json.loads(created.changes)
+
+
+def test_compaction_folds_old_events_into_snapshot(db):
+    bill = Bill(name="Rent", recipient="Landlord", due_day=1, amount=1500)
+    db.add(bill)
+    record_created(db, bill)
+    before = bill_state(bill)
+    bill.amount = 1600
+    bill.paid = True
+    record_updated(db, bill, before)
+    db.commit()
+
+    removed, snapshots = compact_history(
+        db, datetime.datetime.now() + datetime.timedelta(seconds=1)
+    )
+    db.commit()
+    assert (removed, snapshots) == (2, 1)
+    [event] = db.query(BillEvent).all()
+    assert event.event == "snapshot"
+    assert json.loads(event.changes) == bill_state(bill)
+
+
+def test_deleted_bill_ids_are_not_reused(db):
+    water = Bill(name="Water", recipient="City", due_day=9, amount=30)
+    db.add(water)
+    record_created(db, water)
+    db.commit()
+    water_id = water.id
+    record_all_deleted(db)
+    db.query(Bill).delete()
+    db.commit()
+
+    phone = Bill(name="Phone", recipient="Verizon", due_day=2, amount=50)
+    db.add(phone)
+    record_created(db, phone)
+    db.commit()
+    assert phone.id != water_id
+    assert [e.event for e in get_history(db, water_id)] == ["deleted", "created"]
+    assert [e.event for e in get_history(db, phone.id)] == ["created"]
+
+
+def test_compaction_keeps_deletion_of_a_reused_id(db):
+    # Databases created before AUTOINCREMENT may share an id between bills
+    start = datetime.datetime(2026, 1, 1)
+    water = bill_state(Bill(name="Water", recipient="City", due_day=9, amount=30))
+    phone = {**water, "name": "Phone", "recipient": "Verizon"}
+    for minutes, event, changes, actor in [
+        (0, "created", water, "alice"),
+        (1, "updated", {"amount": [30, 35]}, "alice"),
+        (2, "deleted", water, "bob"),
+        (3, "created", phone, "carol"),
+        (4, "updated", {"amount": [50, 55]}, "carol"),
+    ]:
+        db.add(
+            BillEvent(
+                bill_id=3,
+                event=event,
+                changes=json.dumps(changes),
+                actor=actor,
+                created_at=start + datetime.timedelta(minutes=minutes),
+            )
+        )
+    db.commit()
+
+    assert compact_history(db, start + datetime.timedelta(days=1)) == (5, 2)
+    db.commit()
+    deleted, current = db.query(BillEvent).order_by(BillEvent.created_at).all()
+    assert (deleted.actor, json.loads(deleted.changes)["name"]) == ("bob", "Water")
+    assert json.loads(deleted.changes)["deleted"] is True
+    assert (current.actor, json.loads(current.changes)["name"]) == ("carol", "Phone")
+    assert "deleted" not in json.loads(current.changes)
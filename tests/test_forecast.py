@@ -0,0 +1,80 @@
+import datetime
+
+from nmba.data.forecast import forecast
+from nmba.data.models import Bill
+from nmba.data.schedule import refresh_due_dates
+
+D = datetime.date
+
+
+def test_forecast_groups_by_period_and_recipient(db):
+    db.add_all(
+        [
+            Bill(name="Rent", recipient="Landlord", due_day=1, amount=1000),
+            Bill(name="Parking", recipient="Landlord", due_day=15, amount=50),
+            Bill(
+                name="Insurance",
+                recipient="Geico",
+                due_day=15,
+                amount=300,
+                frequency="monthly",
+                interval=3,
+                anchor_date=D(2026, 1, 15),
+            ),
+            Bill(
+                name="Gym",
+                recipient="Planet",
+                due_day=20,
+                amount=10,
+                frequency="weekly",
+                interval=2,
+                anchor_date=D(2026, 10, 20),
+            ),
+        ]
+    )
+    db.commit()
+    today = D(2026, 10, 19)
+    refresh_due_dates(db, today)
+    db.commit()
+
+    rows, missing = forecast(db, today, D(2027, 1, 18))
+    assert missing == []
+    assert rows == [
+        (D(2026, 10, 1), "Planet", 1, 10.0),
+        (D(2026, 11, 1), "Landlord", 2, 1050.0),
+        (D(2026, 11, 1), "Planet", 2, 20.0),
+        (D(2026, 12, 1), "Landlord", 2, 1050.0),
+        (D(2026, 12, 1), "Planet", 3, 30.0),
+        (D(2027, 1, 1), "Geico", 1, 300.0),
+        (D(2027, 1, 1), "Landlord", 2, 1050.0),
+        (D(2027, 1, 1), "Planet", 1, 10.0),
+    ]
+
+    weekly, _ = forecast(db, today, D(2026, 11, 1), "week", by_recipient=False)
+    assert weekly == [
+        (D(2026, 10, 19), None, 1, 10.0),
+        (D(2026, 10, 26), None, 1, 1000.0),
+    ]
+
+
+def test_forecast_leaves_out_currencies_without_a_rate(db):
+    db.add_all(
+        [
+            Bill(name="Rent", recipient="Landlord", due_day=1, amount=1000),
+            Bill(
+                name="Flat",
+                recipient="Vermieter",
+                due_day=1,
+                amount=800,
+                currency="EUR",
+            ),
+        ]
+    )
+    db.commit()
+    today = D(2026, 10, 19)
+    refresh_due_dates(db, today)
+    db.commit()
+
+    rows, missing = forecast(db, today, D(2026, 11, 18))
+    assert rows == [(D(2026, 11, 1), "Landlord", 1, 1000.0)]
+    assert missing == ["EUR"]
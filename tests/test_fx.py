@@ -0,0 +1,83 @@
+import datetime
+
+import pytest
+
+from nmba.data.fx import (
+    RateCache,
+    converted_total,
+    format_amount,
+    parse_currency,
+    read_rate_file,
+    store_rates,
+)
+from nmba.data.models import Bill
+
+DAY = datetime.date(2026, 3, 1)
+
+
+@pytest.fixture
+def db(db):
+    """Bills in three currencies, with EUR rates only."""
+    db.add_all(
+        [
+            Bill(name="Rent", recipient="A", due_day=1, amount=100, currency="USD"),
+            Bill(name="Flat", recipient="B", due_day=1, amount=50, currency="EUR"),
+            Bill(name="Tea", recipient="C", due_day=1, amount=10, currency="GBP"),
+        ]
+    )
+    store_rates(
+        db,
+        [
+            {"currency": "EUR", "date": DAY, "rate": 1.1},
+            {"currency": "EUR", "date": DAY + datetime.timedelta(days=10), "rate": 1.2},
+        ],
+        "USD",
+    )
+    db.commit()
+    return db
+
+
+def test_converted_total_uses_latest_rate_on_or_before_date(db):
+    assert converted_total(db, as_of=DAY + datetime.timedelta(days=5)) == (
+        "USD",
+        pytest.approx(155.0),
+        ["GBP"],
+    )
+    assert converted_total(db, as_of=DAY + datetime.timedelta(days=30))[1] == (
+        pytest.approx(160.0)
+    )
+    assert converted_total(db, Bill.currency == "USD", as_of=DAY)[1] == 100
+    assert converted_total(db, as_of=DAY - datetime.timedelta(days=1))[2] == [
+        "EUR",
+        "GBP",
+    ]
+
+
+def test_rate_cache_reloads_after_invalidation(db):
+    cache = RateCache()
+    convert = cache.converter(db, DAY)
+    assert convert(10, "EUR") == pytest.approx(11.0)
+    assert convert(10, "USD") == 10
+    assert convert(10, "GBP") is None
+    store_rates(db, [{"currency": "EUR", "date": DAY, "rate": 2.0}], "USD")
+    assert cache.get(db, DAY)[1] == {"EUR": 1.1}
+    cache.invalidate()
+    assert cache.get(db, DAY)[1] == {"EUR": 2.0}
+
+
+def test_changing_base_currency_discards_old_rates(db):
+    store_rates(db, [{"currency": "USD", "date": DAY, "rate": 0.9}], "EUR")
+    assert converted_total(db, as_of=DAY) == ("EUR", pytest.approx(140.0), ["GBP"])
+
+
+def test_read_rate_file_validates_rows(tmp_path):
+    path = tmp_path / "rates.csv"
+    path.write_text("currency,date,rate\neur,2026-03-01,1.1\n", encoding="utf-8")
+    assert read_rate_file(str(path)) == [{"currency": "EUR", "date": DAY, "rate": 1.1}]
+    path.write_text("currency,date,rate\nEUR,2026-03-01,-1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Row 1"):
+        read_rate_file(str(path))
+    with pytest.raises(ValueError):
+        parse_currency("euro")
+    assert format_amount(5, "EUR") == "€5.00"
+    assert format_amount(5, "CHF") == "5.00 CHF"
@@ -0,0 +1,132 @@
+import datetime
+
+import pytest
+
+from nmba import notifications
+from nmba.notifications import (
+    compile_template,
+    digest_message,
+    send_to_target,
+    split_messages,
+)
+
+
+def bills(count):
+    return [
+        {
+            "name": f"Bill {i}",
+            "recipient": "Acme",
+            "due_date": datetime.date(2026, 1, 1) + datetime.timedelta(days=i),
+            "amount": 10.0,
+            "currency": "USD",
+            "money": "$10.00",
+            "schedule": "monthly on day 1",
+            "base_amount": 10.0,
+        }
+        for i in range(count)
+    ]
+
+
+def test_compile_template_is_cached_and_validated():
+    render = compile_template("{name}: ${amount:.2f} on {due_date:%b %d}")
+    assert render is compile_template("{name}: ${amount:.2f} on {due_date:%b %d}")
+    assert render(bills(1)[0]) == "Bill 0: $10.00 on Jan 01"
+    with pytest.raises(ValueError):
+        compile_template("{total}")
+    with pytest.raises(ValueError):
+        compile_template("{name:.2f}")
+
+
+def test_split_messages_breaks_between_lines():
+    messages = list(split_messages(["a" * 4, "b" * 4, "c" * 4, "d" * 20], 10))
+    assert messages == ["aaaa\nbbbb", "cccc", "d" * 9 + "…"]
+
+
+def test_digest_message_summarizes_what_does_not_fit():
+    render = compile_template("{name}")
+    body = digest_message(iter(bills(50)), render, 60, 50, 500.0, "https://x.y")
+    assert len(body) <= 60
+    assert body.startswith("Bill 0\nBill 1\n")
+    assert body.endswith("...and 47 more ($470.00): https://x.y")
+
+
+def test_digest_and_title_note_currencies_without_a_rate(monkeypatch):
+    rows = bills(50)
+    rows[40].update(currency="EUR", money="€10.00", base_amount=None)
+    render = compile_template("{name}")
+    body = digest_message(
+        iter(rows), render, 70, 50, 490.0, "https://x.y", missing=["EUR"]
+    )
+    assert body.endswith("...and 47 more ($460.00 excl. EUR): https://x.y")
+
+    sent = []
+
+    class Plugin:
+        body_maxlen = 1024
+
+        def notify(self, body, title):
+            sent.append(title)
+            return True
+
+    monkeypatch.setattr(
+        notifications.apprise.Apprise, "instantiate", lambda url: Plugin()
+    )
+    send_to_target("json://localhost", {}, rows[:3], 3, 30.0, missing=["EUR"])
+    assert sent[0].endswith("(Total: $30.00 excl. EUR)")
+    send_to_target(
+        "json://localhost",
+        {"title": "{count} bills"},
+        rows[:3],
+        3,
+        30.0,
+        missing=["EUR"],
+    )
+    assert sent[1] == "3 bills (excl. EUR)"
+
+
+def test_send_to_target_numbers_split_messages(monkeypatch):
+    sent = []
+
+    class Plugin:
+        body_maxlen = 1024
+
+        def notify(self, body, title):
+            sent.append((title, body))
+            return True
+
+    monkeypatch.setattr(
+        notifications.apprise.Apprise, "instantiate", lambda url: Plugin()
+    )
+    result = send_to_target("json://localhost", {"max_length": 50}, bills(6), 6, 60.0)
+    assert result == (len(sent), True)
+    assert len(sent) > 1
+    assert [title for title, _ in sent][-1].endswith(f"(Total: $60.00) ({len(sent)})")
+    assert all(len(body) <= 50 for _, body in sent)
+    assert sum(body.count("\n") + 1 for _, body in sent) == 6
+
+
+def test_set_notify_target_keeps_options_not_passed(engine, monkeypatch):
+    from sqlalchemy.orm import Session, sessionmaker
+    from typer.testing import CliRunner
+
+    from nmba.cli import app, notify_options
+    from nmba.data import database
+
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine))
+    url = "json://localhost"
+    runner = CliRunner()
+    for args in (
+        ["--template", "{name}", "--mode", "digest", "--link", "https://x"],
+        ["--max-length", "160"],
+        ["--link", ""],
+    ):
+        result = runner.invoke(app, ["config-set-notify-target", url, *args])
+        assert result.exit_code == 0, result.output
+
+    with Session(engine) as db:
+        assert notify_options(db, url) == {
+            "template": "{name}",
+            "mode": "digest",
+            "link": "",
+            "max_length": 160,
+        }
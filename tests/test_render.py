@@ -0,0 +1,38 @@
+import io
+
+import pytest
+from rich.console import Console
+from sqlalchemy import select
+
+from nmba.data.models import Bill
+from nmba.render import QueryRows, render_table
+
+
+@pytest.fixture
+def rows(db):
+    db.add_all(
+        Bill(name=f"Bill {i}", recipient="Acme", due_day=1, amount=i)
+        for i in range(1, 6)
+    )
+    db.commit()
+    return QueryRows(
+        db,
+        select(Bill.id, Bill.name, Bill.amount).order_by(Bill.id),
+        lambda row: (str(row.id), row.name, f"${row.amount:.2f}"),
+        batch_size=2,
+    )
+
+
+def test_query_rows_counts_slices_and_streams(rows):
+    assert len(rows) == 5
+    assert rows[1:3] == [("2", "Bill 2", "$2.00"), ("3", "Bill 3", "$3.00")]
+    assert [row[0] for row in rows] == ["1", "2", "3", "4", "5"]
+
+
+def test_render_table_streams_tsv_when_not_a_terminal(rows):
+    out = io.StringIO()
+    columns = [("ID", {}), ("Name", {}), ("Amount", {"justify": "right"})]
+    render_table(Console(file=out), "Bills", columns, rows[:2])
+    assert out.getvalue() == (
+        "Bills\nID\tName\tAmount\n1\tBill 1\t$1.00\n2\tBill 2\t$2.00\n"
+    )
@@ -0,0 +1,72 @@
+import datetime
+
+import pytest
+from nmba.data.models import Bill
+from nmba.data.schedule import next_occurrence, parse_frequency, refresh_due_dates
+
+D = datetime.date
+
+
+@pytest.mark.parametrize(
+    "frequency, interval, due_day, anchor, today, expected",
+    [
+        ("monthly", 1, 5, None, D(2026, 10, 5), D(2026, 10, 5)),
+        ("monthly", 1, 5, None, D(2026, 10, 6), D(2026, 11, 5)),
+        ("monthly", 1, 31, None, D(2026, 2, 1), D(2026, 2, 28)),
+        ("monthly", 3, 15, D(2026, 1, 15), D(2026, 10, 19), D(2027, 1, 15)),
+        ("monthly", 3, 15, D(2026, 1, 15), D(2026, 10, 15), D(2026, 10, 15)),
+        ("yearly", 1, 29, D(2024, 2, 29), D(2025, 1, 1), D(2025, 2, 28)),
+        ("weekly", 2, 6, D(2026, 10, 6), D(2026, 10, 19), D(2026, 10, 20)),
+        ("daily", 10, 1, D(2026, 11, 1), D(2026, 10, 19), D(2026, 11, 1)),
+    ],
+)
+def test_next_occurrence(frequency, interval, due_day, anchor, today, expected):
+    assert next_occurrence(frequency, interval, due_day, anchor, today) == expected
+
+
+def test_parse_frequency_aliases():
+    assert parse_frequency("Quarterly") == ("monthly", 3)
+    assert parse_frequency("weekly", 2) == ("weekly", 2)
+    with pytest.raises(ValueError):
+        parse_frequency("fortnightly-ish")
+
+
+def test_refresh_only_rolls_stale_bills_forward(db):
+    db.add_all(
+        [
+            Bill(name="Rent", recipient="Landlord", due_day=1, amount=1500),
+            Bill(
+                name="Water",
+                recipient="City",
+                due_day=20,
+                amount=40,
+                next_due_date=D(2026, 10, 20),
+            ),
+        ]
+    )
+    db.commit()
+    assert refresh_due_dates(db, D(2026, 10, 19)) == 1
+    assert refresh_due_dates(db, D(2026, 10, 21)) == 1
+    db.commit()
+    dates = {b.name: b.next_due_date for b in db.query(Bill)}
+    assert dates == {"Rent": D(2026, 11, 1), "Water": D(2026, 11, 20)}
+
+
+def test_edit_bill_rejects_zero_interval_and_reports_no_change(engine, db, monkeypatch):
+    from sqlalchemy.orm import sessionmaker
+    from typer.testing import CliRunner
+
+    from nmba.cli import app
+    from nmba.data import database
+
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine))
+    db.add(Bill(name="Rent", recipient="Landlord", due_day=1, amount=1500))
+    db.commit()
+    db.close()
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["edit-bill", "1", "--interval", "0"])
+    assert result.exit_code == 1
+    assert "Interval must be at least 1" in result.output
+    result = runner.invoke(app, ["edit-bill", "1", "--amount", "1500"])
+    assert "No fields changed" in result.output
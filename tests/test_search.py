@@ -0,0 +1,51 @@
+import pytest
+
+from nmba.data.models import Bill
+from nmba.data.search import prefix_query, search_bills
+
+pytestmark = pytest.mark.usefixtures("search_db")
+
+
+def test_prefix_query_quotes_terms():
+    assert prefix_query('gas "co') == '"gas"* """co"*'
+
+
+def test_search_tracks_inserts_updates_and_deletes(db):
+    db.add_all(
+        [
+            Bill(name="Electric", recipient="Con Edison", due_day=5, amount=80),
+            Bill(name="Internet", recipient="Comcast", due_day=12, amount=60),
+        ]
+    )
+    db.commit()
+    assert [r.name for r in search_bills(db, "elec")] == ["Electric"]
+    assert [r.name for r in search_bills(db, "comc")] == ["Internet"]
+
+    bill = db.query(Bill).filter(Bill.name == "Internet").one()
+    bill.recipient = "Verizon"
+    db.commit()
+    assert search_bills(db, "comcast") == []
+    assert [r.name for r in search_bills(db, "veri")] == ["Internet"]
+
+    db.delete(bill)
+    db.commit()
+    assert search_bills(db, "internet") == []
+
+
+def test_fuzzy_search_tolerates_typos(db):
+    db.add(Bill(name="Internet", recipient="Comcast", due_day=12, amount=60))
+    db.commit()
+    assert search_bills(db, "comcsat") == []
+    assert [r.name for r in search_bills(db, "comcsat", fuzzy=True)] == ["Internet"]
+
+
+def test_fuzzy_search_needs_more_than_one_shared_trigram(db):
+    db.add_all(
+        [
+            Bill(name="Water", recipient="City", due_day=3, amount=40),
+            Bill(name="Flat", recipient="Vermieter", due_day=1, amount=800),
+        ]
+    )
+    db.commit()
+    # "vermeiter" shares only "ter" with Water / City
+    assert [r.name for r in search_bills(db, "vermeiter", fuzzy=True)] == ["Flat"]